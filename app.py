@@ -1,11 +1,16 @@
 import streamlit as st
-import requests
-import folium
-from streamlit_folium import st_folium
 from streamlit_searchbox import st_searchbox 
-import math
 import os 
-import base64 
+from kakao_client import KAKAO_API_BASE
+from governor import QuotaThrottled
+from recommend import Recommender
+from vibes import DEFAULT_VIBE, VIBES
+from maps import build_detail_map, build_result_map
+from assets import build_assets
+from metrics import collect_stats, register_stats
+import tracing
+
+tracing.start_trace("rerun")
 
 # --- 🔑 보안: API 키 설정 ---
 try:
@@ -14,98 +19,89 @@ except Exception:
     st.error("🚨 API 키를 찾을 수 없습니다. .streamlit/secrets.toml 파일을 확인해주세요!")
     st.stop()
 
-# --- 🛠️ [유지] 이미지 Base64 변환 함수 (로고용) ---
-def get_img_as_base64(file_path):
-    """이미지 파일을 읽어서 HTML에서 쓸 수 있는 문자열로 변환합니다."""
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except Exception:
-        return None
-
-# --- 📍 전국 주요 핫플레이스 DB ---
-NATIONWIDE_HOTSPOTS = {
-    "서울 강남역": { "coords": (37.498095, 127.027610), "desc": "교통 요지이자 맛집/쇼핑의 메카" },
-    "서울 홍대입구": { "coords": (37.557527, 126.9244669), "desc": "버스킹, 클럽, 맛집이 모인 젊음의 거리" },
-    "서울 건대입구": { "coords": (37.540458, 127.069320), "desc": "맛집, 술집, 쇼핑이 가득한 거리" },
-    "서울 용산역": { "coords": (37.529886, 126.964801), "desc": "아이파크몰, 이태원 접근성 우수" },
-    "서울 종로3가": { "coords": (37.570415, 126.992161), "desc": "익선동 한옥거리와 포장마차 감성" },
-    "서울 잠실역": { "coords": (37.513261, 127.100133), "desc": "롯데월드몰과 석촌호수 산책" },
-    "서울 사당역": { "coords": (37.476553, 126.981550), "desc": "경기 남부와 서울을 잇는 관문" },
-    "서울 명동": { "coords": (37.560997, 126.986175), "desc": "외국인 관광객과 쇼핑의 중심지" },
-    "서울 성수동": { "coords": (37.544579, 127.055967), "desc": "힙한 카페와 팝업스토어 성지" },
-    "판교역": { "coords": (37.394761, 127.111194), "desc": "현대백화점과 아브뉴프랑" },
-    "수원역": { "coords": (37.265679, 127.000047), "desc": "AK플라자, 롯데몰 등 거대 상권" },
-    "인천 부평": { "coords": (37.489493, 126.724068), "desc": "거대 지하상가와 문화의 거리" },
-    "대전 둔산동": { "coords": (36.350412, 127.384548), "desc": "대전의 핫플레이스, 갤러리아 인근" },
-    "대전역": { "coords": (36.332516, 127.434156), "desc": "성심당 본점과 가까운 KTX 허브" },
-    "천안 터미널": { "coords": (36.819830, 127.155822), "desc": "백화점과 먹자골목이 모인 천안 중심" },
-    "청주 터미널": { "coords": (36.626490, 127.432657), "desc": "청주 교통과 쇼핑의 중심" },
-    "강릉역": { "coords": (37.763740, 128.899484), "desc": "KTX 내리면 바로 바다 여행" },
-    "원주 터미널": { "coords": (37.344463, 127.930492), "desc": "강원 영서 최대 번화가" },
-    "춘천 명동": { "coords": (37.880628, 127.727506), "desc": "닭갈비 골목과 낭만 여행" },
-    "부산 서면": { "coords": (35.157816, 129.060033), "desc": "부산 쇼핑과 맛집의 정중앙" },
-    "부산역": { "coords": (35.115225, 129.042243), "desc": "차이나타운과 부산 여행의 시작" },
-    "부산 해운대": { "coords": (35.163113, 129.163550), "desc": "바다와 럭셔리한 맛집들" },
-    "대구 동성로": { "coords": (35.869666, 128.594038), "desc": "대구 최대 번화가, 젊음의 거리" },
-    "동대구역": { "coords": (35.871435, 128.624925), "desc": "신세계백화점과 복합환승센터" },
-    "울산 삼산동": { "coords": (35.539622, 129.335967), "desc": "백화점과 관람차가 있는 울산 중심" },
-    "광주 충장로": { "coords": (35.148154, 126.915598), "desc": "광주의 명동, 패션과 문화의 거리" },
-    "광주 유스퀘어": { "coords": (35.160167, 126.879307), "desc": "아시아 최대 터미널과 복합문화공간" },
-    "전주 한옥마을": { "coords": (35.814708, 127.152632), "desc": "먹거리와 한옥이 어우러진 관광 명소" }
-}
+# --- 🌟 캐릭터 이미지 파일명 ---
+friend_chars = ["friend1.png", "friend2.png", "friend3.png", "friend4.png"]
+
+# --- 🛠️ 이미지 에셋 (로고/캐릭터를 표시 크기로 줄여서 한 번만 만들어 둠) ---
+@st.cache_resource(show_spinner=False)
+def get_assets():
+    """로고/캐릭터 이미지의 크기별 변형 (WebP 바이트 + data URI)."""
+    return build_assets("favicon.png", friend_chars)
 
 # --- 🛠️ 함수 정의 ---
-def calculate_distance(lat1, lon1, lat2, lon2):
-    R = 6371
-    d_lat = math.radians(lat2 - lat1)
-    d_lon = math.radians(lon2 - lon1)
-    a = math.sin(d_lat / 2) * math.sin(d_lat / 2) + \
-        math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
-        math.sin(d_lon / 2) * math.sin(d_lon / 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+# 추천 로직은 recommend.py(Streamlit 없이 import 가능)에 있고, 여기서는 화면 라벨을 코어 인자로 바꿔서 부르기만 합니다.
+RESPONSE_CACHE_PATH = os.environ.get("MIDMEET_CACHE_PATH", ".cache/kakao_responses.sqlite3")
+# 오프라인 대역 서버(bench/fake_kakao.py)로 돌릴 때는 이 값을 바꿉니다.
+KAKAO_API_BASE_URL = os.environ.get("KAKAO_API_BASE_URL", KAKAO_API_BASE)
+# 앱 키 하나의 호출 한도에 맞춰 정합니다 (초당 호출 수 / 한꺼번에 몰아 쓸 수 있는 양).
+KAKAO_RATE_PER_SEC = float(os.environ.get("KAKAO_RATE_PER_SEC", "10"))
+KAKAO_RATE_BURST = int(os.environ.get("KAKAO_RATE_BURST", "20"))
+THROTTLED_MESSAGE = "⏳ 지금 이용자가 많아서 장소를 불러오지 못했어요. 잠시 후 다시 시도해주세요!"
+
+@st.cache_resource
+def get_recommender():
+    """모든 세션이 공유하는 추천 코어 (카카오 클라이언트/캐시/호출량 조절기/카탈로그/이동시간 표)."""
+    rec = Recommender(KAKAO_REST_API_KEY, base_url=KAKAO_API_BASE_URL, cache_path=RESPONSE_CACHE_PATH,
+                      rate=KAKAO_RATE_PER_SEC, burst=KAKAO_RATE_BURST)
+    for name, fn in rec.stats_providers().items():
+        register_stats(name, fn)
+    # 장소/순위/중간 지점 캐시는 예전 st.cache_data 자리라서 디버그 패널의 적중률 표에도 같이 보여줍니다.
+    for name, fn in rec.cache_providers().items():
+        tracing.register_cache(name, fn)
+    return rec
+
+# '기준 선택' (화면 라벨 -> recommend의 algo)
+ALGO_OPTIONS = {"거리 우선 추천": "distance", "놀거리 우선 추천 (전국 주요 번화가 중 최적)": "hotspot"}
+
+# '놀거리 우선 추천' 순위 기준 (화면 라벨 -> recommend의 rank_by)
+RANK_OBJECTIVES = {"총 이동시간": "minutes_sum", "가장 오래 걸리는 친구": "minutes_max", "총 직선거리": "sum"}
+
+# '거리 우선 추천'의 중간 지점 기준 (화면 라벨 -> recommend의 midpoint)
+# transit_*는 좌표 계산 대신 이동시간 표에서 점수가 가장 좋은 역을 중간 지점으로 씁니다.
+MIDPOINT_METHODS = {"총 이동거리 최소": "median", "가장 먼 친구 기준": "minimax", "평균 위치": "centroid",
+                    "총 이동시간 최소 (대중교통)": "transit_sum", "최대 이동시간 최소 (대중교통)": "transit_max"}
+
+# 상세 보기 (session_state.detail_view의 mode -> (recommend의 mode, 화면 라벨))
+DETAIL_MODES = {"detail_food": ("food", "맛집"), "detail_cafe": ("cafe", "카페"), "detail_play": ("play", "놀거리")}
 
 def search_kakao_for_box(searchterm: str):
     if not searchterm: return []
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
     try:
-        res = requests.get(url, headers=headers, params={"query": searchterm, "size": 15})
-        data = res.json().get('documents', [])
+        data = get_recommender().search(searchterm)
         return [(f"{item['place_name']} ({item['address_name']})", item) for item in data]
     except: return []
 
-@st.cache_data(show_spinner=False)
-def get_hotplace_nearby(lat, lon, radius=5000):
-    url = "https://dapi.kakao.com/v2/local/search/category.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
-    params = {"category_group_code": "SW8", "x": str(lon), "y": str(lat), "radius": radius, "sort": "distance", "size": 15}
-    try:
-        res = requests.get(url, headers=headers, params=params).json()
-        documents = res.get('documents', [])
-        if not documents:
-            params['category_group_code'] = "CT1"
-            url_k = "https://dapi.kakao.com/v2/local/search/keyword.json"
-            params_k = {"query": "터미널", "x": str(lon), "y": str(lat), "radius": radius, "sort": "distance"}
-            res_k = requests.get(url_k, headers=headers, params=params_k).json()
-            documents = res_k.get('documents', [])
-        return documents[:3]
-    except: return []
-
-@st.cache_data(show_spinner=False)
-def get_nearby_details(lat, lon, category_code):
-    url = "https://dapi.kakao.com/v2/local/search/category.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
-    params = {"category_group_code": category_code, "x": str(lon), "y": str(lat), "radius": 1500, "sort": "accuracy"}
-    try:
-        res = requests.get(url, headers=headers, params=params)
-        return res.json().get('documents', []) if res.status_code == 200 else []
-    except: return []
+@tracing.traced_cache(st.cache_data(show_spinner=False, max_entries=256))
+def get_result_map_html(place, friends):
+    """추천 장소 + 친구들 지도 HTML (같은 입력이면 다시 만들지 않습니다)."""
+    with tracing.span("folium_build"):
+        return build_result_map(place, friends)
+
+@tracing.traced_cache(st.cache_data(show_spinner=False, max_entries=256))
+def get_detail_map_html(place, items):
+    """장소 주변 상세 지도 HTML (같은 입력이면 다시 만들지 않습니다)."""
+    with tracing.span("folium_build"):
+        return build_detail_map(place, items)
+
+def show_map(html, height):
+    """지도 HTML을 iframe으로 내보냅니다 (직렬화 시간을 span으로 잽니다)."""
+    with tracing.span("map_emit"):
+        st.iframe(html, height=height)
+
+def render_debug_panel(trace):
+    """MIDMEET_TRACE=1일 때 화면 맨 아래에 이번 rerun의 타이밍과 캐시 통계를 보여줍니다."""
+    with st.expander(f"🛠️ 디버그: 이번 실행 {trace.total_ms:.0f} ms"):
+        st.table([{"구간": s["name"], "ms": s["ms"], "시작(ms)": s["start_ms"]} for s in trace.spans])
+        st.markdown("**캐시 적중률 (st.cache_data + 추천 코어)**")
+        st.json(tracing.cache_stats())
+        st.markdown("**공용 캐시/클라이언트 통계**")
+        st.json(collect_stats())
+        st.markdown("**Prometheus**")
+        st.code(tracing.prometheus_text(), language="text")
 
 # --- 🎨 UI 디자인 ---
-st.set_page_config(page_title="MIDMEET", page_icon="favicon.png", layout="wide")
+assets = get_assets()
+st.set_page_config(page_title="MIDMEET", page_icon=assets["page_icon"].data if assets["page_icon"] else None, layout="wide")
 
 st.markdown("""
     <style>
@@ -170,13 +166,206 @@ if "step" not in st.session_state: st.session_state.step = "input"
 if "num_friends" not in st.session_state: st.session_state.num_friends = 3
 if "coords" not in st.session_state: st.session_state.coords = {}
 if "names" not in st.session_state: st.session_state.names = {}
-if "vibe" not in st.session_state: st.session_state.vibe = "🍚 맛집 투어"
+if "vibe" not in st.session_state: st.session_state.vibe = DEFAULT_VIBE
 if "saved_algo_option" not in st.session_state: st.session_state.saved_algo_option = "거리 우선 추천" 
+if "saved_mid_label" not in st.session_state: st.session_state.saved_mid_label = "총 이동거리 최소"
+if "saved_rank_label" not in st.session_state: st.session_state.saved_rank_label = "총 직선거리"
+if "detail_view" not in st.session_state: st.session_state.detail_view = None
+if "hotplaces" not in st.session_state: st.session_state.hotplaces = []
+tracing.annotate(step=st.session_state.step)
+
+vibe_options = list(VIBES)
+
+# --- 🧩 결과 화면 패널 ---
+# 결과 화면은 패널마다 st.fragment로 나눠서, 패널 안의 위젯을 바꾸면 그 패널만 다시 실행됩니다.
+# 패널끼리는 아래 session_state 키로만 주고받습니다.
+# - detail_view: None(목록) 또는 (순위 인덱스, "detail_food"/"detail_cafe"/"detail_play").
+#   바뀌면 화면 구성 자체가 달라지므로 바꾸는 쪽에서 전체 rerun(st.rerun())을 합니다.
+# - hotplaces: 추천 패널이 계산한 추천 장소 목록. 장소 패널은 인자로, 상세 패널은 이 키로 받습니다.
+# - vibe: 헤더 패널이 쓰고 상세 패널이 읽습니다 (목록 화면에는 vibe에 따라 달라지는 부분이 없음).
+
+@st.fragment
+@tracing.traced_fragment
+def render_result_header(in_detail):
+    """뒤로가기 + 제목 + 목적 변경. 목적을 바꿔도 이 패널만 다시 그립니다."""
+    col_back, col_res_title, col_vibe_change = st.columns([0.15, 0.45, 0.4])
 
-# --- 🌟 캐릭터 이미지 파일명 ---
-friend_chars = ["friend1.png", "friend2.png", "friend3.png", "friend4.png"]
-vibe_options = ["🍚 맛집 투어", "🍻 술/회식", "☕ 카페/수다", "📚 스터디/조용함"]
-alcohol_kws = ["고기", "곱창", "막창", "갈비", "삼겹살", "구이", "포차", "주점", "호프", "맥주", "이자카야", "술집"]
+    # 뒤로가기 버튼 로직
+    with col_back:
+        if in_detail:
+            if st.button("⬅️ 뒤로"):
+                st.session_state.detail_view = None
+                st.rerun()
+        else:
+            if st.button("⬅️ 처음"):
+                st.session_state.step = "input"
+                st.session_state.detail_view = None
+                st.rerun()
+
+    with col_res_title:
+        st.markdown("## 🎉 추천 결과")
+
+    # 목적 변경 (상세 화면 아닐 때만 노출)
+    if not in_detail:
+        with col_vibe_change:
+            st.session_state.vibe = st.selectbox(
+                "목적 변경", 
+                vibe_options,
+                index=vibe_options.index(st.session_state.vibe),
+                label_visibility="collapsed"
+            )
+
+@st.fragment
+@tracing.traced_fragment
+def render_ranking():
+    """기준 선택 + 추천 장소 계산. 기준을 바꾸면 이 패널과 그 안의 장소 패널만 다시 실행됩니다."""
+    # 상세 화면에 다녀오면 위젯 상태가 지워지므로 저장해 둔 값으로 다시 채웁니다.
+    if "algo_selector" not in st.session_state: st.session_state.algo_selector = st.session_state.saved_algo_option
+    algo_option = st.radio(
+        "기준 선택",
+        list(ALGO_OPTIONS), 
+        horizontal=True,
+        key="algo_selector"
+    )
+    st.session_state.saved_algo_option = algo_option
+    algo = ALGO_OPTIONS[algo_option]
+
+    if algo == "distance":
+        if "mid_selector" not in st.session_state: st.session_state.mid_selector = st.session_state.saved_mid_label
+        st.session_state.saved_mid_label = st.radio(
+            "중간 지점 기준",
+            list(MIDPOINT_METHODS),
+            horizontal=True,
+            key="mid_selector"
+        )
+    else:
+        if "rank_selector" not in st.session_state: st.session_state.rank_selector = st.session_state.saved_rank_label
+        st.session_state.saved_rank_label = st.radio(
+            "순위 기준",
+            list(RANK_OBJECTIVES),
+            horizontal=True,
+            key="rank_selector"
+        )
+
+    # 세션마다 직전 중간 지점을 기억해뒀다가, 출발지가 바뀌면 거기서 출발해서 다시 풉니다 (warm start).
+    result = get_recommender().recommend(
+        tuple(st.session_state.coords.values()),
+        st.session_state.vibe,
+        algo=algo,
+        midpoint=MIDPOINT_METHODS[st.session_state.saved_mid_label],
+        rank_by=RANK_OBJECTIVES[st.session_state.saved_rank_label],
+        k=3,
+        x0=st.session_state.get("midpoint"),
+    )
+    hotplaces = result["places"]
+    mid = result["midpoint"]
+
+    if mid is not None:
+        st.session_state.midpoint = (mid["lat"], mid["lon"])
+        if "station" in mid:
+            st.info(f"🚇 **중간 지점**: {mid['station']} 주변 (이동시간 합계 {mid['total_min']}분, 가장 오래 걸리는 친구 {mid['max_min']}분)")
+        else:
+            st.info(f"📍 **중간 지점**: 위도 {mid['lat']:.4f}, 경도 {mid['lon']:.4f} 주변 (가장 먼 친구까지 {mid['radius_km']:.1f}km)")
+    elif hotplaces:
+        best = hotplaces[0]
+        minutes_note = f" (이동시간 합계 {best['total_min']}분, 가장 오래 걸리는 친구 {best['max_min']}분)" if "total_min" in best else ""
+        st.success(f"🔥 **{best['place_name']}** 가 가장 합리적인 장소입니다!{minutes_note}")
+
+    st.session_state.hotplaces = hotplaces
+    if result["throttled"]:
+        st.warning(THROTTLED_MESSAGE)
+    elif not hotplaces:
+        st.warning("주변에 추천할만한 장소가 없네요 ㅠㅠ")
+    else:
+        # 상세 조회 프리페치는 recommend()가 이미 시작해 뒀습니다.
+        render_place_map(hotplaces)
+
+@st.fragment
+@tracing.traced_fragment
+def render_place_map(hotplaces):
+    """순위 선택 + 장소 카드 + 지도 + 상세 보기 버튼. 순위를 바꾸면 이 패널만 다시 그립니다."""
+    rank_labels = [f"{i+1}위: {p['place_name']}" for i, p in enumerate(hotplaces)]
+    
+    st.write("👇 추천 장소를 선택하세요")
+    selected_rank_label = st.radio("순위 선택", rank_labels, horizontal=True, label_visibility="collapsed")
+    
+    i = rank_labels.index(selected_rank_label)
+    p = hotplaces[i]
+    
+    pl, plo = float(p['y']), float(p['x'])
+
+    st.markdown(f"""
+    <div style="padding: 10px; border: 2px solid #eee; border-radius: 10px; margin-top: 10px;">
+        <h3 style="margin:0;">🥇 {p['place_name']}</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if p.get('desc'): st.info(f"💡 {p['desc']}")
+    
+    friends = []
+    for idx, c in st.session_state.coords.items():
+        fn = st.session_state.names.get(idx, f"친구 {idx+1}")
+        ic = assets["friend_markers"][idx].data_uri if idx < 4 and assets["friend_markers"][idx] else None
+        friends.append((c[0], c[1], fn, ic))
+    
+    show_map(get_result_map_html((pl, plo), tuple(friends)), height=350)
+
+    st.write("")
+    b1, b2, b3 = st.columns(3)
+    
+    def go_detail(k_suffix, mode_val, label):
+        if st.button(label, key=k_suffix, use_container_width=True):
+            with st.spinner(f"{label.split(' ')[1]} 찾는 중..."):
+                st.session_state.detail_view = (i, mode_val)
+                st.rerun()
+
+    with b1: go_detail(f"bf_{i}", "detail_food", "🍴 맛집 보기")
+    with b2: go_detail(f"bc_{i}", "detail_cafe", "☕ 카페 보기")
+    with b3: go_detail(f"bp_{i}", "detail_play", "🎡 놀거리 보기")
+
+@st.fragment
+@tracing.traced_fragment
+def render_detail_list(p, current_mode):
+    """상세 보기 (지도 + 주변 장소 목록). 추천 장소 p와 vibe에만 의존합니다."""
+    p_lat, p_lon = float(p['y']), float(p['x'])
+    mode, label = DETAIL_MODES[current_mode]
+    try:
+        details = get_recommender().details(p, mode, st.session_state.vibe)
+    except QuotaThrottled:
+        st.warning(THROTTLED_MESSAGE)
+        details = []
+
+    # 🌟 [수정] 줄바꿈 & 새 창 열기 적용!
+    kakao_map_search_url = f"https://map.kakao.com/link/search/{p['place_name']} {label}"
+    
+    # 제목 출력
+    st.markdown(f"### 🗺️ {p['place_name']} 주변 {label}")
+    
+    # 링크 출력 (제목 아래에 별도로 위치시켜서 글자 짤림 방지)
+    st.markdown(f"""
+    <a href='{kakao_map_search_url}' target='_blank' 
+       style='display:block; margin-bottom:10px; font-size:15px; color:#3672e4; font-weight:bold; text-decoration:none;'>
+       🔗 카카오맵으로 크게 보기 (클릭)
+    </a>
+    """, unsafe_allow_html=True)
+    
+    detail_items = tuple((float(item['y']), float(item['x']), item['place_name']) for item in details[:15])
+    show_map(get_detail_map_html((p_lat, p_lon), detail_items), height=400)
+
+    st.write("---")
+    
+    # 🌟 정렬 라벨: 목적(vibe) 점수 순, 점수가 같으면 가까운 순 (recommend.Recommender.details)
+    st.markdown("#### 🎖️ 목적에 맞는 순 (같으면 가까운 순)")
+    
+    for x in details[:10]:
+        st.markdown(f"""
+        <div class="place-container">
+            <div style="flex:1;">
+                <div style="font-weight:bold; font-size:1.15rem; margin-bottom:3px;">{x['place_name']}</div>
+                <div style="color:#666; font-size:0.9rem;">{x['category_name'].split(' > ')[-1]}</div>
+                <a href="{x['place_url']}" target="_blank" style="font-weight:bold; color:blue; font-size:0.9rem;">📍 카카오맵 보기</a>
+            </div>
+        </div>""", unsafe_allow_html=True)
 
 
 # ==========================================
@@ -186,11 +375,11 @@ if st.session_state.step == "input":
     
     col_title_main, col_logo = st.columns([0.8, 0.2])
     with col_title_main:
-        icon_base64 = get_img_as_base64("favicon.png")
-        if icon_base64:
+        logo = assets["logo"]
+        if logo:
             st.markdown(f"""
                 <h1 style='display: flex; align-items: center;'>
-                    <img src="data:image/png;base64,{icon_base64}" width='55' style='margin-right: 15px; margin-top: 5px;'>
+                    <img src="{logo.data_uri}" width='55' style='margin-right: 15px; margin-top: 5px;'>
                     MIDMEET
                 </h1>
                 """, unsafe_allow_html=True)
@@ -232,8 +421,8 @@ if st.session_state.step == "input":
         
         with col_char:
             st.markdown(f"**친구 {i+1}**")
-            if i < 4 and os.path.exists(friend_chars[i]):
-                st.image(friend_chars[i], width=250)
+            if i < 4 and assets["friend_cards"][i]:
+                st.image(assets["friend_cards"][i].data, width=250)
             else:
                 st.write("😐")
         
@@ -246,7 +435,8 @@ if st.session_state.step == "input":
                 search_kakao_for_box, 
                 key=sb_key, 
                 placeholder=f"친구 {i+1} 출발지 (예: 강남역)",
-                clear_on_submit=False
+                clear_on_submit=False,
+                debounce=300
             )
             
             if selected_place:
@@ -282,185 +472,19 @@ if st.session_state.step == "input":
 # 📺 화면 2: 결과 보기
 # ==========================================
 elif st.session_state.step == "result":
-    
-    col_back, col_res_title, col_vibe_change = st.columns([0.15, 0.45, 0.4])
-    
-    # 현재 상세화면(Detail) 상태인지 확인
-    active_detail_idx = -1
-    for key in st.session_state:
-        if key.startswith("view_mode_tab_") and st.session_state[key].startswith("detail_"):
-            active_detail_idx = int(key.split("_")[-1])
-            break
-
-    # 뒤로가기 버튼 로직
-    with col_back:
-        if active_detail_idx != -1:
-            if st.button("⬅️ 뒤로"):
-                st.session_state[f"view_mode_tab_{active_detail_idx}"] = "list"
-                st.rerun()
-        else:
-            if st.button("⬅️ 처음"):
-                st.session_state.step = "input"
-                for key in list(st.session_state.keys()):
-                    if key.startswith("view_mode_tab_"): del st.session_state[key]
-                st.rerun()
-            
-    with col_res_title:
-        st.markdown("## 🎉 추천 결과")
-        
-    # 목적 변경 (상세 화면 아닐 때만 노출)
-    if active_detail_idx == -1:
-        with col_vibe_change:
-            st.session_state.vibe = st.selectbox(
-                "목적 변경", 
-                vibe_options,
-                index=vibe_options.index(st.session_state.vibe),
-                label_visibility="collapsed"
-            )
+    detail_view = st.session_state.detail_view
 
+    render_result_header(detail_view is not None)
     st.divider()
 
-    # 알고리즘 선택 (상세 화면 아닐 때만)
-    if active_detail_idx == -1:
-        algo_option = st.radio(
-            "기준 선택",
-            ["거리 우선 추천", "놀거리 우선 추천 (전국 주요 번화가 중 최적)"], 
-            horizontal=True,
-            key="algo_selector"
-        )
-        st.session_state.saved_algo_option = algo_option
+    if detail_view is None:
+        render_ranking()
     else:
-        algo_option = st.session_state.saved_algo_option
-
-    coords = st.session_state.coords
-    hotplaces = [] 
-
-    if algo_option == "거리 우선 추천":
-        mid_lat = sum(c[0] for c in coords.values()) / len(coords)
-        mid_lon = sum(c[1] for c in coords.values()) / len(coords)
-        if active_detail_idx == -1:
-            st.info(f"📍 **중간 지점**: 위도 {mid_lat:.4f}, 경도 {mid_lon:.4f} 주변")
-        hotplaces = get_hotplace_nearby(mid_lat, mid_lon, radius=5000)
-    else:
-        candidates = []
-        for name, data in NATIONWIDE_HOTSPOTS.items():
-            h_lat, h_lon = data["coords"]
-            h_desc = data["desc"]
-            total_dist = sum(calculate_distance(c[0], c[1], h_lat, h_lon) for c in coords.values())
-            candidates.append({"place_name": name, "y": str(h_lat), "x": str(h_lon), "desc": h_desc, "total_dist": total_dist})
-        candidates.sort(key=lambda x: x["total_dist"])
-        hotplaces = candidates[:3]
-        if active_detail_idx == -1:
-            st.success(f"🔥 **{hotplaces[0]['place_name']}** 가 가장 합리적인 장소입니다!")
-
-    if not hotplaces:
-        st.warning("주변에 추천할만한 장소가 없네요 ㅠㅠ")
-    else:
-        # ====================================================
-        # [A] 상세 보기 모드 (지도 + 상세 리스트)
-        # ====================================================
-        if active_detail_idx != -1:
-            p = hotplaces[active_detail_idx]
-            p_lat, p_lon = float(p['y']), float(p['x'])
-            current_mode = st.session_state[f"view_mode_tab_{active_detail_idx}"]
-            
-            if current_mode == "detail_play":
-                label="놀거리" 
-                details = get_nearby_details(p_lat, p_lon, "AT4") + get_nearby_details(p_lat, p_lon, "CT1")
-            elif current_mode == "detail_food":
-                label="맛집"
-                details = get_nearby_details(p_lat, p_lon, "FD6")
-                if st.session_state.vibe == "🍻 술/회식":
-                    details.sort(key=lambda x: any(k in x['category_name'] or k in x['place_name'] for k in alcohol_kws), reverse=True)
-            else:
-                label="카페"
-                details = get_nearby_details(p_lat, p_lon, "CE7")
-                if st.session_state.vibe == "📚 스터디/조용함":
-                    details = [d for d in details if not ("보드" in d['place_name'] or "보드" in d['category_name'])]
-
-            # 🌟 [수정] 줄바꿈 & 새 창 열기 적용!
-            kakao_map_search_url = f"https://map.kakao.com/link/search/{p['place_name']} {label}"
-            
-            # 제목 출력
-            st.markdown(f"### 🗺️ {p['place_name']} 주변 {label}")
-            
-            # 링크 출력 (제목 아래에 별도로 위치시켜서 글자 짤림 방지)
-            st.markdown(f"""
-            <a href='{kakao_map_search_url}' target='_blank' 
-               style='display:block; margin-bottom:10px; font-size:15px; color:#3672e4; font-weight:bold; text-decoration:none;'>
-               🔗 카카오맵으로 크게 보기 (클릭)
-            </a>
-            """, unsafe_allow_html=True)
-            
-            m_det = folium.Map(location=[p_lat, p_lon], zoom_start=15, tiles="cartodbpositron")
-            folium.Marker([p_lat, p_lon], icon=folium.Icon(color='red', icon='star')).add_to(m_det)
-            for item in details[:15]:
-                folium.Marker([float(item['y']), float(item['x'])], tooltip=item['place_name'], icon=folium.Icon(color='blue', icon='info-sign')).add_to(m_det)
-            st_folium(m_det, width="100%", height=400, key="detail_map_view", returned_objects=[])
-
-            st.write("---")
-            
-            # 🌟 '추천순' 라벨
-            st.markdown("#### 🎖️ 추천순 (카카오맵 인기 기준)")
-            
-            for x in details[:10]:
-                st.markdown(f"""
-                <div class="place-container">
-                    <div style="flex:1;">
-                        <div style="font-weight:bold; font-size:1.15rem; margin-bottom:3px;">{x['place_name']}</div>
-                        <div style="color:#666; font-size:0.9rem;">{x['category_name'].split(' > ')[-1]}</div>
-                        <a href="{x['place_url']}" target="_blank" style="font-weight:bold; color:blue; font-size:0.9rem;">📍 카카오맵 보기</a>
-                    </div>
-                </div>""", unsafe_allow_html=True)
-
-        # ====================================================
-        # [B] 기본 결과 모드 (버튼 방식 + fit_bounds 적용)
-        # ====================================================
-        else:
-            rank_labels = [f"{i+1}위: {p['place_name']}" for i, p in enumerate(hotplaces)]
-            
-            st.write("👇 추천 장소를 선택하세요")
-            selected_rank_label = st.radio("순위 선택", rank_labels, horizontal=True, label_visibility="collapsed")
-            
-            i = rank_labels.index(selected_rank_label)
-            p = hotplaces[i]
-            
-            pl, plo = float(p['y']), float(p['x'])
-            vk = f"view_mode_tab_{i}"
-            if vk not in st.session_state: st.session_state[vk] = "list"
-
-            st.markdown(f"""
-            <div style="padding: 10px; border: 2px solid #eee; border-radius: 10px; margin-top: 10px;">
-                <h3 style="margin:0;">🥇 {p['place_name']}</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if p.get('desc'): st.info(f"💡 {p['desc']}")
-            
-            all_points = [[pl, plo]]
-            for c in coords.values(): all_points.append([c[0], c[1]])
-            
-            m = folium.Map(location=[pl, plo], tiles="cartodbpositron")
-            folium.Marker([pl, plo], icon=folium.Icon(color='red', icon='star'), tooltip="중간지점").add_to(m)
-            
-            for idx, c in coords.items():
-                fn = st.session_state.names.get(idx, f"친구 {idx+1}")
-                ic = folium.CustomIcon(friend_chars[idx], icon_size=(90, 90)) if idx < 4 and os.path.exists(friend_chars[idx]) else None
-                folium.Marker(c, icon=ic, tooltip=fn).add_to(m)
-            
-            m.fit_bounds(all_points) 
-            
-            st_folium(m, width="100%", height=350, key=f"main_map_{i}", returned_objects=[])
-
-            st.write("")
-            b1, b2, b3 = st.columns(3)
-            
-            def go_detail(k_suffix, mode_val, label):
-                if st.button(label, key=k_suffix, use_container_width=True):
-                    with st.spinner(f"{label.split(' ')[1]} 찾는 중..."):
-                        st.session_state[vk] = mode_val
-                        st.rerun()
-
-            with b1: go_detail(f"bf_{i}", "detail_food", "🍴 맛집 보기")
-            with b2: go_detail(f"bc_{i}", "detail_cafe", "☕ 카페 보기")
-            with b3: go_detail(f"bp_{i}", "detail_play", "🎡 놀거리 보기")
\ No newline at end of file
+        # 상세 화면은 목록 화면에서 계산해 둔 추천 장소를 그대로 씁니다 (다시 계산하지 않음).
+        idx, mode = detail_view
+        render_detail_list(st.session_state.hotplaces[idx], mode)
+
+# --- 🛠️ 디버그 패널 (MIDMEET_TRACE=1 일 때만) ---
+trace = tracing.end_trace()
+if trace is not None:
+    render_debug_panel(trace)
\ No newline at end of file
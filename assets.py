@@ -0,0 +1,52 @@
+"""이미지 에셋을 화면에 쓰는 크기로 미리 줄여두는 모듈.
+
+원본 PNG(로고 200KB, 캐릭터 80~120KB)를 그대로 보내지 않고,
+표시 크기(레티나 대비 2배)에 맞춰 줄인 WebP/PNG 바이트와 data URI를 한 번만 만들어 둡니다.
+"""
+import base64
+import io
+import os
+from collections import namedtuple
+
+from PIL import Image
+
+ImageAsset = namedtuple("ImageAsset", ["data", "mime", "data_uri"])
+
+
+def make_variant(path, size, fmt="WEBP", quality=80):
+    """path 이미지를 size로 줄인 ImageAsset. 파일이 없으면 None.
+
+    size가 정수면 가로 폭만 맞추고(비율 유지), (w, h)면 그 크기 그대로 맞춥니다.
+    """
+    if not os.path.exists(path):
+        return None
+    with Image.open(path) as img:
+        img.load()
+        if isinstance(size, int):
+            w = min(size, img.width)
+            size = (w, max(1, round(img.height * w / img.width)))
+        img = img.resize(size, Image.LANCZOS)
+        buf = io.BytesIO()
+        if fmt == "WEBP":
+            img.save(buf, "WEBP", quality=quality, method=6)
+        else:
+            img.save(buf, fmt, optimize=True)
+    data = buf.getvalue()
+    mime = f"image/{fmt.lower()}"
+    return ImageAsset(data, mime, f"data:{mime};base64,{base64.b64encode(data).decode()}")
+
+
+def build_assets(logo_path, friend_paths):
+    """앱에서 쓰는 이미지 변형들을 한꺼번에 만듭니다.
+
+    - logo: 제목 옆 로고 (55px 표시)
+    - page_icon: 브라우저 탭 아이콘 (PNG)
+    - friend_cards: 입력 화면 캐릭터 (250px 표시)
+    - friend_markers: 지도 마커 (90x90 표시, 기존처럼 정사각형으로 맞춤)
+    """
+    return {
+        "logo": make_variant(logo_path, 110),
+        "page_icon": make_variant(logo_path, 64, fmt="PNG"),
+        "friend_cards": [make_variant(p, 500) for p in friend_paths],
+        "friend_markers": [make_variant(p, (180, 180)) for p in friend_paths],
+    }
@@ -0,0 +1,116 @@
+"""그룹 목록(JSONL)을 한꺼번에 추천하는 일괄 처리 도구.
+
+    python batch.py groups.jsonl -o results.jsonl --workers 8
+
+입력은 한 줄에 그룹 하나입니다 (origins만 필수, 나머지는 recommend.Recommender.recommend 기본값):
+    {"id": "g1", "origins": [[37.498, 127.028], "홍대입구역"], "vibe": "🍻 술/회식", "algo": "hotspot",
+     "midpoint": "median", "rank_by": "minutes_sum", "k": 3}
+origins 항목이 문자열이면 카카오 키워드 검색 첫 번째 결과의 좌표를 씁니다.
+
+모든 워커 스레드가 Recommender 하나(커넥션 풀, 디스크/인메모리 캐시, 호출량 조절기)를 같이 쓰므로
+같은 동네의 그룹이 많을수록 카카오 호출이 줄어듭니다. 결과는 입력 순서대로 한 줄씩 쓰고,
+끝나면 처리량(groups/s), 그룹당 지연시간 p50/p95/p99, 실패/쿼터 부족 수, 캐시 통계를 stderr에 출력합니다.
+API 키는 --api-key 또는 KAKAO_REST_API_KEY 환경변수로 줍니다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from governor import QuotaThrottled
+from kakao_client import KAKAO_API_BASE
+from recommend import DEFAULT_CACHE_PATH, Recommender
+
+GROUP_OPTIONS = ("vibe", "algo", "midpoint", "rank_by", "k")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+
+def read_groups(path):
+    with (sys.stdin if path == "-" else open(path, encoding="utf-8")) as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                group = json.loads(line)
+                group.setdefault("id", n)
+                yield group
+
+
+def resolve_origin(rec, origin):
+    """[lat, lon] 은 그대로, 문자열은 키워드 검색 첫 번째 결과의 (lat, lon)."""
+    if isinstance(origin, str):
+        place = rec.find_place(origin)
+        if place is None:
+            raise ValueError(f"no place found for {origin!r}")
+        return float(place['y']), float(place['x'])
+    lat, lon = origin
+    return float(lat), float(lon)
+
+
+def run_group(rec, group, with_details):
+    started = time.perf_counter()
+    try:
+        origins = [resolve_origin(rec, o) for o in group["origins"]]
+        options = {k: group[k] for k in GROUP_OPTIONS if k in group}
+        # 화면처럼 나중에 상세 보기를 누를 사람이 없으므로 카테고리 전체 프리페치는 하지 않습니다.
+        result = rec.recommend(origins, with_details=with_details, prefetch=False, **options)
+        row = {"id": group["id"], "ok": True, **result}
+    except QuotaThrottled:
+        # 출발지 이름을 쿼터 부족으로 못 찾은 것도 실패가 아니라 추천 쪽처럼 throttled로 셉니다.
+        row = {"id": group["id"], "ok": True, "places": [], "throttled": True}
+    except Exception as e:
+        row = {"id": group["id"], "ok": False, "error": repr(e)}
+    row["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIDMEET batch recommender")
+    parser.add_argument("input", help="그룹 JSONL 파일 (- 이면 stdin)")
+    parser.add_argument("-o", "--output", default="-", help="결과 JSONL 파일 (기본: stdout)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--details", action="store_true", help="장소마다 목적에 맞는 맛집/카페 목록도 같이 조회")
+    parser.add_argument("--api-key", default=os.environ.get("KAKAO_REST_API_KEY"))
+    parser.add_argument("--base-url", default=os.environ.get("KAKAO_API_BASE_URL", KAKAO_API_BASE))
+    parser.add_argument("--cache-path", default=os.environ.get("MIDMEET_CACHE_PATH", DEFAULT_CACHE_PATH))
+    parser.add_argument("--rate", type=float, default=float(os.environ.get("KAKAO_RATE_PER_SEC", "10")))
+    parser.add_argument("--burst", type=int, default=int(os.environ.get("KAKAO_RATE_BURST", "20")))
+    args = parser.parse_args()
+    if not args.api_key:
+        parser.error("--api-key or KAKAO_REST_API_KEY is required")
+
+    rec = Recommender(args.api_key.strip(), base_url=args.base_url, cache_path=args.cache_path,
+                      rate=args.rate, burst=args.burst)
+    latencies, failed, throttled = [], 0, 0
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="batch") as pool:
+            # map은 입력 순서대로 결과를 내주므로 끝난 앞쪽 그룹부터 바로 씁니다.
+            for row in pool.map(lambda g: run_group(rec, g, args.details), read_groups(args.input)):
+                latencies.append(row["ms"])
+                failed += not row["ok"]
+                throttled += bool(row.get("throttled"))
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    n = len(latencies)
+    print(f"{n} groups x {args.workers} workers: {elapsed:.2f}s ({n / elapsed if elapsed else 0:.1f} groups/s)", file=sys.stderr)
+    print(f"latency ms p50={percentile(latencies, 0.5)} p95={percentile(latencies, 0.95)} p99={percentile(latencies, 0.99)}"
+          f" failed={failed} throttled={throttled}", file=sys.stderr)
+    for name, stats in rec.stats().items():
+        print(f"{name}: {json.dumps(stats, ensure_ascii=False)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""카카오 로컬 API(keyword.json / category.json) 오프라인 대역 서버.
+
+실제 dapi.kakao.com과 API 키 없이 앱을 돌리고 성능을 재기 위한 서버입니다.
+녹화된 응답(fixture)이 있으면 그대로 돌려주고, 없으면 요청 파라미터로 시드를 잡은
+가짜 장소 목록을 만들어 줍니다. 응답 지연과 오류(429/500) 비율을 조절할 수 있습니다.
+
+    python bench/fake_kakao.py --port 8765 --latency-ms 40 --jitter-ms 20 --error-rate 0.02
+    KAKAO_API_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+fixture는 앱의 디스크 캐시(.cache/kakao_responses.sqlite3)나 {캐시 키: 응답} 모양의 JSON 파일을 쓸 수 있습니다.
+실제 키로 한 번 앱을 돌려 디스크 캐시를 채워두면 그게 곧 녹화본이 됩니다
+(디스크 캐시 키에는 base_url이 들어 있어서, 실제 카카오 응답만 골라 씁니다).
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kakao_client import KAKAO_API_BASE  # noqa: E402
+from response_cache import cache_key  # noqa: E402
+
+ENDPOINTS = ("/v2/local/search/keyword.json", "/v2/local/search/category.json")
+TOTAL_PLACES = 45
+
+CATEGORY_NAMES = {
+    "FD6": ["음식점 > 한식 > 육류,고기 > 삼겹살", "음식점 > 한식 > 곱창,막창", "음식점 > 술집 > 호프,요리주점",
+            "음식점 > 일식 > 초밥,롤", "음식점 > 양식 > 이탈리안", "음식점 > 한식 > 국밥", "음식점 > 중식 > 중국요리"],
+    "CE7": ["음식점 > 카페 > 커피전문점", "음식점 > 카페 > 테마카페 > 보드카페", "음식점 > 카페 > 디저트카페",
+            "음식점 > 카페 > 스터디카페"],
+    "AT4": ["여행 > 관광,명소 > 공원", "여행 > 관광,명소 > 전망대", "여행 > 관광,명소 > 테마거리"],
+    "CT1": ["문화,예술 > 영화,영화관", "문화,예술 > 공연장,연극극장", "문화,예술 > 미술관"],
+    "SW8": ["교통,수송 > 지하철,전철 > 수도권2호선", "교통,수송 > 지하철,전철 > 수도권7호선"],
+}
+NAME_WORDS = ["행복", "골목", "바다", "숲속", "별빛", "한옥", "로컬", "모퉁이", "달빛", "소소"]
+
+
+def fixture_key(key):
+    """캐시 키에서 base_url을 떼고 '엔드포인트?파라미터'만 남깁니다. 실제 카카오가 아닌 base_url이면 None."""
+    if key.startswith("/"):
+        return key
+    if not key.startswith(KAKAO_API_BASE + "/"):
+        return None
+    return key[len(KAKAO_API_BASE):]
+
+
+def load_fixtures(path):
+    """디스크 캐시(sqlite3) 또는 JSON 파일에서 {캐시 키: 응답}을 읽습니다."""
+    if not path:
+        return {}
+    if path.endswith((".sqlite3", ".sqlite", ".db")):
+        conn = sqlite3.connect(path)
+        try:
+            rows = [(key, json.loads(value)) for key, value in conn.execute("SELECT key, value FROM responses")]
+        finally:
+            conn.close()
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f).items()
+    fixtures = {}
+    for key, value in rows:
+        key = fixture_key(key)
+        if key is not None:
+            fixtures[key] = value
+    return fixtures
+
+
+def synthetic_response(path, params):
+    """같은 파라미터면 항상 같은 결과가 나오는 가짜 검색 결과."""
+    page = int(params.get("page", 1))
+    size = int(params.get("size", 15))
+    # 페이지/크기를 뺀 나머지로 시드를 잡아야 페이지끼리 같은 장소 목록을 나눠 씁니다.
+    seed_key = cache_key(path, {k: v for k, v in params.items() if k not in ("page", "size")})
+    rng = random.Random(hashlib.sha1(seed_key.encode()).hexdigest())
+
+    code = params.get("category_group_code", "")
+    query = params.get("query", "")
+    if "x" in params and "y" in params:
+        cx, cy = float(params["x"]), float(params["y"])
+    else:
+        cx, cy = 126.9 + rng.random() * 2.2, 35.1 + rng.random() * 2.8
+    radius_m = float(params.get("radius", 1500))
+
+    places = []
+    for i in range(TOTAL_PLACES):
+        r = radius_m * math.sqrt(rng.random())
+        theta = rng.random() * 2 * math.pi
+        lat = cy + r * math.sin(theta) / 111190
+        lon = cx + r * math.cos(theta) / (111190 * math.cos(math.radians(cy)))
+        category = rng.choice(CATEGORY_NAMES.get(code, ["여행 > 관광,명소"]))
+        base = query or rng.choice(NAME_WORDS)
+        name = f"{base} {category.split(' > ')[-1]} {i + 1}호점" if code != "SW8" else f"{rng.choice(NAME_WORDS)}{i + 1}역"
+        places.append({
+            "id": hashlib.md5(f"{seed_key}#{i}".encode()).hexdigest()[:10],
+            "place_name": name,
+            "category_name": category,
+            "category_group_code": code,
+            "address_name": f"가상시 가상구 {rng.randint(1, 300)}",
+            "road_address_name": "",
+            "phone": "",
+            "x": f"{lon:.7f}",
+            "y": f"{lat:.7f}",
+            "distance": str(int(r)),
+            "place_url": f"http://place.map.kakao.com/{i}",
+        })
+    if params.get("sort") == "distance":
+        places.sort(key=lambda p: int(p["distance"]))
+
+    start = (page - 1) * size
+    return {
+        "documents": places[start:start + size],
+        "meta": {"total_count": TOTAL_PLACES, "pageable_count": TOTAL_PLACES,
+                 "is_end": start + size >= TOTAL_PLACES, "same_name": None},
+    }
+
+
+class FakeKakao:
+    """대역 서버 설정 + 통계. handler가 이 객체를 참조합니다."""
+
+    def __init__(self, fixtures=None, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.fixtures = fixtures or {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+            self.errors = 0
+            self.fixture_hits = 0
+
+    def stats(self):
+        with self._lock:
+            return {"requests": dict(self.counts), "total": sum(self.counts.values()),
+                    "errors": self.errors, "fixture_hits": self.fixture_hits}
+
+    def respond(self, path, params):
+        """(status, body dict, headers)."""
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+            status = self._rng.choice((429, 500)) if fail else 200
+            if fail:
+                self.errors += 1
+        time.sleep(delay)
+        if status == 429:
+            return status, {"errorType": "RateLimitExceeded", "message": "fake quota"}, {"Retry-After": "0"}
+        if status != 200:
+            return status, {"errorType": "InternalServerError", "message": "fake error"}, {}
+
+        fixture = self.fixtures.get(cache_key(path, params))
+        if fixture is not None:
+            with self._lock:
+                self.fixture_hits += 1
+            return 200, fixture, {}
+        return 200, synthetic_response(path, params), {}
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, headers=None):
+            data = json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/__stats":
+                return self._send(200, fake.stats())
+            if url.path == "/__reset":
+                fake.reset()
+                return self._send(200, {"ok": True})
+            if url.path not in ENDPOINTS:
+                return self._send(404, {"errorType": "NotFound", "message": url.path})
+            if not self.headers.get("Authorization", "").startswith("KakaoAK "):
+                return self._send(401, {"errorType": "AccessDeniedError", "message": "missing KakaoAK key"})
+            status, body, headers = fake.respond(url.path, dict(parse_qsl(url.query)))
+            self._send(status, body, headers)
+
+    return Handler
+
+
+def start_server(fake, host="127.0.0.1", port=0):
+    """백그라운드 스레드에서 서버를 띄우고 (server, base_url)을 돌려줍니다."""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="녹화된 응답 (.sqlite3 디스크 캐시 또는 JSON)")
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    fake = FakeKakao(load_fixtures(args.fixtures), args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    print(f"fake kakao on http://{args.host}:{server.server_port} ({len(fake.fixtures)} fixtures)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""오프라인 대역 서버 위에서 앱 전체 흐름(입력 -> 결과 -> 상세)을 동시 세션으로 돌리는 벤치마크.
+
+    python bench/load_test.py --sessions 20 --concurrency 8 --latency-ms 40 --error-rate 0.01
+
+각 세션은 Streamlit AppTest로 실제 app.py를 실행합니다. AppTest는 한 프로세스 안에서
+동시에 돌릴 수 없어서, --concurrency개의 워커 프로세스가 세션을 나눠 맡습니다
+(같은 호스트에 Streamlit 워커 여러 개 + 디스크 캐시 공유와 같은 구성).
+1) 친구마다 출발지 검색어를 한 글자씩 입력 (자동완성 캐시 경유)
+2) 검색 결과 선택 -> '중간 지점 찾기' -> 기준/순위 변경
+3) 맛집/카페 상세 보기
+AppTest는 검색창 컴포넌트 입력을 흉내 낼 수 없어서, 1)은 앱과 같은 설정의
+TypeaheadSearch를 벤치마크가 직접 불러서 재고, 고른 결과를 세션 상태에 넣어줍니다.
+AppTest는 st.fragment 안의 위젯을 바꿔도 스크립트 전체를 다시 실행하므로, 여기서 재는 시간은
+프래그먼트 부분 실행이 아닌 전체 rerun 기준입니다 (실제 브라우저에서는 바뀐 패널만 다시 실행됨).
+
+결과로 단계별 rerun 지연시간 p50/p95/p99, 업스트림(대역 서버) 호출 수,
+앱 캐시들의 적중률(metrics 레지스트리)을 출력합니다. --json이면 JSON 한 줄로 출력합니다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_kakao import FakeKakao, load_fixtures, start_server  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+QUERIES = ["강남역", "홍대입구역", "잠실역", "건대입구역", "사당역", "신촌역", "왕십리역", "수원역",
+           "판교역", "부평역", "노원역", "여의도역", "성수역", "구로디지털단지역", "천호역", "일산역"]
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+
+class Recorder:
+    """단계별 지연시간(ms) 샘플과 실패한 세션 목록."""
+
+    def __init__(self):
+        self.samples = {}
+        self.failures = []
+
+    def timed(self, phase, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        self.samples.setdefault(phase, []).append((time.perf_counter() - started) * 1000)
+        return result
+
+    def merge(self, samples, failures):
+        for phase, values in samples.items():
+            self.samples.setdefault(phase, []).extend(values)
+        self.failures += failures
+
+    def summary(self):
+        reruns = [ms for phase, values in self.samples.items() if phase not in ("typeahead", "cold_start") for ms in values]
+        rows = {"all_reruns": reruns, **self.samples}
+        return {phase: {"n": len(v), "p50": percentile(v, 0.50), "p95": percentile(v, 0.95), "p99": percentile(v, 0.99)}
+                for phase, v in rows.items()}
+
+
+def merge_stats(snapshots):
+    """워커별 캐시 통계를 합칩니다. 정수는 더하고, hit_rate는 조회 수로 가중 평균합니다."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, stats in snapshot.items():
+            out = merged.setdefault(name, {"_lookups": 0, "_weighted": 0.0, "_rated": "hit_rate" in stats})
+            for k, v in stats.items():
+                if isinstance(v, int) and not isinstance(v, bool) and k not in ("maxsize", "burst"):
+                    out[k] = out.get(k, 0) + v
+            lookups = stats.get("hits", 0) + stats.get("misses", 0)
+            if stats.get("hit_rate") is not None:
+                out["_lookups"] += lookups
+                out["_weighted"] += stats["hit_rate"] * lookups
+    for out in merged.values():
+        lookups, weighted, rated = out.pop("_lookups"), out.pop("_weighted"), out.pop("_rated")
+        if rated:
+            out["hit_rate"] = round(weighted / lookups, 3) if lookups else None
+    return merged
+
+
+def find_button(at, label=None, key=None):
+    """label 또는 key가 주어진 접두어로 시작하는 첫 번째 버튼."""
+    return next(b for b in at.button
+                if (label and b.label.startswith(label)) or (key and b.key and b.key.startswith(key)))
+
+
+def new_app(args):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    at.secrets["general"] = {"kakao_api_key": "bench"}
+    return at
+
+
+def run_session(sid, args, typeahead, rec):
+    rng = random.Random(sid)
+    at = new_app(args)
+    rec.timed("input", at.run)
+    if args.friends != 3:
+        at.session_state.num_friends = args.friends
+        rec.timed("input", at.run)
+
+    for i in range(args.friends):
+        query = rng.choice(QUERIES)
+        docs = []
+        for end in range(1, len(query) + 1):
+            docs = rec.timed("typeahead", typeahead.search, query[:end]) or docs
+        key = f"search_stable_{i}"
+        state = dict(at.session_state[key])
+        state["result"] = docs[rng.randrange(len(docs))] if docs else None
+        at.session_state[key] = state
+        rec.timed("select", at.run)
+
+    find_button(at, label="🚀").click()
+    rec.timed("result", at.run)
+
+    algo = at.radio(key="algo_selector")
+    algo.set_value(rng.choice(algo.options))
+    rec.timed("algo", at.run)
+
+    rank = next((r for r in at.radio if r.label == "순위 선택"), None)
+    i = 0
+    if rank is not None and len(rank.options) > 1:
+        i = rng.randrange(len(rank.options))
+        rank.set_value(rank.options[i])
+        rec.timed("rank", at.run)
+
+    # 상세 화면에서 돌아오면 순위 선택이 1위로 돌아가므로 버튼은 key 접두어로 찾습니다.
+    for prefix in ("bf_", "bc_"):
+        find_button(at, key=prefix).click()
+        rec.timed("detail", at.run)
+        find_button(at, label="⬅️").click()
+        rec.timed("back", at.run)
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def run_worker(worker, session_ids, args, base_url, cache_path):
+    """워커 프로세스 하나: 앱과 같은 설정의 자동완성 캐시를 만들고 맡은 세션을 차례로 돌립니다."""
+    # app.py는 실행될 때 이 환경변수를 읽으므로 첫 AppTest 전에 정해둡니다.
+    os.environ["KAKAO_API_BASE_URL"] = base_url
+    os.environ["MIDMEET_CACHE_PATH"] = cache_path
+
+    from metrics import collect_stats
+    from recommend import Recommender
+
+    typeahead = Recommender("bench", base_url=base_url, cache_path=cache_path).typeahead
+    rec = Recorder()
+    # 프로세스의 첫 실행은 import/캐시 생성 비용이 섞이므로 따로 잽니다.
+    rec.timed("cold_start", new_app(args).run)
+    for sid in session_ids:
+        try:
+            run_session(sid, args, typeahead, rec)
+        except Exception as e:
+            rec.failures.append(f"session {sid}: {e!r}")
+    return rec.samples, rec.failures, {"bench_typeahead": typeahead.stats(), **collect_stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIDMEET end-to-end load benchmark")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--friends", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=15)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", help="대역 서버에 줄 녹화 응답 (.sqlite3 또는 JSON)")
+    parser.add_argument("--base-url", help="이미 떠 있는 대역 서버 주소 (없으면 내부에서 띄움)")
+    parser.add_argument("--cache-path", help="앱 디스크 캐시 경로 (없으면 매번 빈 임시 파일 = 콜드 스타트)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    fake = None
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+        urlopen(f"{base_url}/__reset").read()
+    else:
+        fake = FakeKakao(load_fixtures(args.fixtures), args.latency_ms, args.jitter_ms, args.error_rate, seed=0)
+        _, base_url = start_server(fake)
+
+    cache_path = args.cache_path or os.path.join(tempfile.mkdtemp(prefix="midmeet-bench-"), "responses.sqlite3")
+    workers = max(1, min(args.concurrency, args.sessions))
+    rec = Recorder()
+    snapshots = []
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(run_worker, w, list(range(w, args.sessions, workers)), args, base_url, cache_path)
+                   for w in range(workers)]
+        for f in futures:
+            samples, failures, stats = f.result()
+            rec.merge(samples, failures)
+            snapshots.append(stats)
+    elapsed = time.perf_counter() - started
+
+    upstream = fake.stats() if fake else json.loads(urlopen(f"{base_url}/__stats").read())
+    report = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "sessions_per_s": round(args.sessions / elapsed, 2),
+        "latency_ms": rec.summary(),
+        "upstream": upstream,
+        "caches": merge_stats(snapshots),
+        "failures": rec.failures,
+    }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False))
+        return
+    print(f"{args.sessions} sessions x concurrency {args.concurrency}: {elapsed:.1f}s ({report['sessions_per_s']} sessions/s)")
+    print(f"{'phase':<12}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}   (ms)")
+    for phase, row in report["latency_ms"].items():
+        print(f"{phase:<12}{row['n']:>6}{row['p50'] or '-':>10}{row['p95'] or '-':>10}{row['p99'] or '-':>10}")
+    print(f"upstream calls: {upstream['total']} {upstream['requests']} errors={upstream['errors']}")
+    for name, stats in report["caches"].items():
+        print(f"cache {name}: {stats}")
+    for failure in rec.failures:
+        print("FAILED", failure)
+
+
+if __name__ == "__main__":
+    main()
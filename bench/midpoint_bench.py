@@ -0,0 +1,99 @@
+"""중간 지점 계산(midpoint.find_midpoint) 마이크로 벤치마크.
+
+    python bench/midpoint_bench.py --sizes 2 3 4 8 32 256 --repeat 2000
+
+그룹 크기마다 무작위 출발지(수도권 범위, 절반은 한 동네에 몰려 있음)를 만들고
+방법별로 콜드 스타트 / warm start(직전 결과에서 출발, 친구 한 명만 조금 이동) 시간을 잽니다.
+위경도 산술 평균과 비교해서 총 이동거리, 가장 먼 친구까지의 거리가 얼마나 줄었는지도 같이 출력합니다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distance import haversine_rad  # noqa: E402
+from midpoint import METHODS, find_midpoint  # noqa: E402
+
+
+def make_group(rng, n):
+    origins = np.column_stack([37.3 + rng.random(n) * 0.5, 126.7 + rng.random(n) * 0.6])
+    # 절반은 한 동네(약 1km 안)에 몰아서 산술 평균이 끌려가는 상황을 만듭니다.
+    cluster = n // 2
+    origins[:cluster] = origins[0] + rng.normal(scale=0.005, size=(cluster, 2))
+    return origins
+
+
+def distances(origins, lat, lon):
+    o = np.radians(origins)
+    return haversine_rad(o[:, 0], o[:, 1], np.radians(lat), np.radians(lon))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+
+def bench(n, method, groups, repeat):
+    cold, warm, iterations, sum_gain, max_gain = [], [], [], [], []
+    for i in range(repeat):
+        origins = groups[i % len(groups)]
+        started = time.perf_counter()
+        mid = find_midpoint(origins, method)
+        cold.append((time.perf_counter() - started) * 1e6)
+        iterations.append(mid.iterations)
+
+        moved = origins.copy()
+        moved[-1] += 0.003
+        started = time.perf_counter()
+        find_midpoint(moved, method, x0=(mid.lat, mid.lon))
+        warm.append((time.perf_counter() - started) * 1e6)
+
+        if i < len(groups):
+            mean = distances(origins, *origins.mean(axis=0))
+            d = distances(origins, mid.lat, mid.lon)
+            sum_gain.append(1 - d.sum() / mean.sum())
+            max_gain.append(1 - d.max() / mean.max())
+    return {
+        "n": n, "method": method,
+        "cold_us_p50": percentile(cold, 0.5), "cold_us_p95": percentile(cold, 0.95),
+        "warm_us_p50": percentile(warm, 0.5), "warm_us_p95": percentile(warm, 0.95),
+        "iterations_mean": round(float(np.mean(iterations)), 1),
+        "sum_dist_vs_mean_pct": round(-100 * float(np.mean(sum_gain)), 2),
+        "max_dist_vs_mean_pct": round(-100 * float(np.mean(max_gain)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="midpoint solver micro-benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 3, 4, 8, 32, 256])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    rows = []
+    for n in args.sizes:
+        groups = [make_group(rng, n) for _ in range(args.groups)]
+        for method in METHODS:
+            find_midpoint(groups[0], method)  # 첫 호출의 import/할당 비용 제외
+            rows.append(bench(n, method, groups, args.repeat))
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False))
+        return
+    print(f"{'n':>5} {'method':<9}{'cold p50':>10}{'p95':>8}{'warm p50':>10}{'p95':>8}{'iters':>7}"
+          f"{'sum vs mean':>13}{'max vs mean':>13}   (us, %)")
+    for r in rows:
+        print(f"{r['n']:>5} {r['method']:<9}{r['cold_us_p50']:>10}{r['cold_us_p95']:>8}{r['warm_us_p50']:>10}"
+              f"{r['warm_us_p95']:>8}{r['iterations_mean']:>7}{r['sum_dist_vs_mean_pct']:>12}%{r['max_dist_vs_mean_pct']:>12}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""NumPy 기반 거리 계산 모듈.
+
+후보 지점 좌표를 라디안 배열로 미리 바꿔두고, 친구들 x 후보 전체의 하버사인 거리 행렬을
+한 번에 계산한 뒤 argpartition으로 상위 k개만 골라냅니다.
+"""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+# 후보별 점수 (작을수록 좋음): 총 이동거리 / 가장 먼 사람 거리 / 거리 편차
+OBJECTIVES = {
+    "sum": lambda d: d.sum(axis=0),
+    "max": lambda d: d.max(axis=0),
+    "var": lambda d: d.var(axis=0),
+}
+
+
+def haversine_rad(lat1, lon1, lat2, lon2):
+    """라디안 좌표 사이의 거리(km). 배열을 넣으면 브로드캐스팅됩니다."""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    """두 지점(도 단위) 사이의 거리(km)."""
+    return float(haversine_rad(*np.radians([lat1, lon1, lat2, lon2])))
+
+
+def top_k_indices(scores, k):
+    """점수가 낮은 순으로 k개 인덱스 (argpartition 후 그 k개만 정렬)."""
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(scores, k - 1)[:k]
+    return idx[np.argsort(scores[idx], kind="stable")]
+
+
+class DistanceEngine:
+    """후보 지점들의 좌표를 라디안 배열로 들고 있는 거리/랭킹 계산기."""
+
+    def __init__(self, lats, lons):
+        self.lat = np.radians(np.asarray(lats, dtype=np.float64))
+        self.lon = np.radians(np.asarray(lons, dtype=np.float64))
+
+    def __len__(self):
+        return len(self.lat)
+
+    def distance_matrix(self, origins, subset=None):
+        """origins [(lat, lon), ...] x 후보 거리 행렬 (friends, candidates), km."""
+        o = np.radians(np.asarray(origins, dtype=np.float64).reshape(-1, 2))
+        lat, lon = (self.lat, self.lon) if subset is None else (self.lat[subset], self.lon[subset])
+        return haversine_rad(o[:, :1], o[:, 1:], lat[None, :], lon[None, :])
+
+    def top_k(self, origins, k=3, objective="sum", subset=None):
+        """점수가 낮은 순으로 (후보 인덱스 배열, 점수 배열, 거리 행렬)을 돌려줍니다."""
+        dist = self.distance_matrix(origins, subset)
+        scores = OBJECTIVES[objective](dist)
+        idx = top_k_indices(scores, k)
+        cand = idx if subset is None else np.asarray(subset)[idx]
+        return cand, scores[idx], dist[:, idx]
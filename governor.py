@@ -0,0 +1,108 @@
+"""프로세스 공용 카카오 API 호출량 조절기 (토큰 버킷 + 우선순위).
+
+모든 세션이 KAKAO_REST_API_KEY 하나의 쿼터를 같이 쓰므로, 초당 호출 수를 토큰 버킷으로 묶고
+토큰이 모자라면 우선순위가 높은 호출(결과 화면)부터 내보냅니다.
+검색창 자동완성은 오래 기다리지 않고 포기해서(캐시된 결과로 대체) 결과 화면 호출에 양보합니다.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+import requests
+
+PRIORITY_RESULT = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_TYPEAHEAD = 2
+
+PRIORITY_NAMES = {PRIORITY_RESULT: "result", PRIORITY_PREFETCH: "prefetch", PRIORITY_TYPEAHEAD: "typeahead"}
+
+# 우선순위별로 토큰을 기다리는 최대 시간(초). 넘으면 QuotaThrottled.
+DEFAULT_MAX_WAIT = {PRIORITY_RESULT: 3.0, PRIORITY_PREFETCH: 5.0, PRIORITY_TYPEAHEAD: 0.3}
+
+
+class QuotaThrottled(requests.RequestException):
+    """쿼터가 모자라서(또는 카카오가 429를 돌려줘서) 호출하지 못했을 때."""
+
+
+class RateGovernor:
+    """초당 rate개, 최대 burst개까지 모아둘 수 있는 토큰 버킷. 기다리는 호출은 우선순위 순으로 깨웁니다."""
+
+    def __init__(self, rate=10.0, burst=20, max_wait=None, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = {**DEFAULT_MAX_WAIT, **(max_wait or {})}
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._counters = {"acquired": 0, "throttled": 0, "max_queue_depth": 0}
+        self._by_priority = {name: {"acquired": 0, "throttled": 0} for name in PRIORITY_NAMES.values()}
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def ticket(self, priority=PRIORITY_RESULT):
+        """acquire(ticket=...)에 넘기는 대기표. 기다리는 동안 promote()로 우선순위를 올릴 수 있습니다."""
+        return [priority, next(self._seq)]
+
+    def promote(self, ticket, priority):
+        """대기표의 우선순위를 priority로 올립니다 (이미 더 높으면 그대로, 올렸으면 True). 줄을 서 있으면 바로 자리가 바뀝니다."""
+        with self._cond:
+            if priority >= ticket[0]:
+                return False
+            ticket[0] = priority
+            heapq.heapify(self._waiters)
+            self._cond.notify_all()
+            return True
+
+    def acquire(self, priority=PRIORITY_RESULT, timeout=None, ticket=None):
+        """토큰 하나를 얻으면 True, timeout(기본: 우선순위별 max_wait) 안에 못 얻으면 False.
+
+        ticket(ticket()으로 만든 대기표)을 주면 그걸로 줄을 섭니다. 기다리는 중에 다른 스레드가
+        promote()하면 높아진 우선순위로 앞으로 갑니다. 통계는 토큰을 얻은/포기한 시점의 우선순위로 셉니다.
+        """
+        timeout = self.max_wait.get(priority, 1.0) if timeout is None else timeout
+        deadline = self._clock() + timeout
+        with self._cond:
+            entry = ticket if ticket is not None else self.ticket(priority)
+            heapq.heappush(self._waiters, entry)
+            self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], len(self._waiters))
+            try:
+                while True:
+                    self._refill()
+                    head = self._waiters[0] is entry
+                    name = PRIORITY_NAMES.get(entry[0], str(entry[0]))
+                    if head and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._counters["acquired"] += 1
+                        self._by_priority[name]["acquired"] += 1
+                        return True
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        self._counters["throttled"] += 1
+                        self._by_priority[name]["throttled"] += 1
+                        return False
+                    # 맨 앞이면 다음 토큰이 찰 때까지만, 아니면 앞사람이 깨워줄 때까지 기다립니다.
+                    wait = min(remaining, (1 - self._tokens) / self.rate) if head else remaining
+                    self._cond.wait(max(wait, 0.001))
+            finally:
+                self._waiters = [w for w in self._waiters if w is not entry]
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {
+                **self._counters,
+                "queue_depth": len(self._waiters),
+                "tokens": round(self._tokens, 2),
+                "rate": self.rate,
+                "burst": self.burst,
+                "by_priority": {k: dict(v) for k, v in self._by_priority.items()},
+            }
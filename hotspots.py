@@ -0,0 +1,167 @@
+"""전국 핫플레이스(만남 후보 지점) 카탈로그.
+
+후보 목록은 data/hotspots.npz (열 단위 배열: name/desc/lat/lon)에서 읽고,
+격자(grid) 공간 인덱스로 친구들 주변 영역의 후보만 골라 정확한 점수를 매깁니다.
+
+CSV에서 npz 만들기:
+    python hotspots.py data/hotspots.csv data/hotspots.npz
+"""
+import csv
+import math
+import sys
+
+import numpy as np
+
+from distance import DistanceEngine, top_k_indices
+from transit import OBJECTIVES as TRANSIT_OBJECTIVES
+
+KM_PER_DEG = 111.19
+
+# 이 개수 이하면 인덱스 없이 전부 계산하는 게 더 빠릅니다.
+FULL_SCAN_LIMIT = 256
+
+
+class GridIndex:
+    """위도/경도를 cell_deg 크기 격자로 나눈 정적 공간 인덱스."""
+
+    def __init__(self, lats, lons, cell_deg=0.25):
+        self.cell_deg = cell_deg
+        # 경도 칸 번호가 음수가 되지 않도록 offset을 더해서 (행, 열)을 정수 키 하나로 합칩니다.
+        self._width = int(360 / cell_deg) + 2
+        self._offset = self._width // 2
+        rows = np.floor(lats / cell_deg).astype(np.int64)
+        cols = np.floor(lons / cell_deg).astype(np.int64) + self._offset
+        keys = rows * self._width + cols
+        self.order = np.argsort(keys, kind="stable")
+        cell_keys, self.starts = np.unique(keys[self.order], return_index=True)
+        self.ends = np.append(self.starts[1:], len(keys))
+        self.cell_rows = cell_keys // self._width
+        self.cell_cols = cell_keys % self._width - self._offset
+        self.lats = lats
+        self.lons = lons
+
+    def query_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """사각형 영역 안에 있는 후보 인덱스 배열."""
+        c = self.cell_deg
+        hit = ((self.cell_rows >= math.floor(lat_min / c)) & (self.cell_rows <= math.floor(lat_max / c)) &
+               (self.cell_cols >= math.floor(lon_min / c)) & (self.cell_cols <= math.floor(lon_max / c)))
+        cells = np.flatnonzero(hit)
+        if len(cells) == 0:
+            return np.empty(0, dtype=np.intp)
+        idx = np.concatenate([self.order[self.starts[i]:self.ends[i]] for i in cells])
+        lat, lon = self.lats[idx], self.lons[idx]
+        inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return np.sort(idx[inside])
+
+
+class HotspotCatalog:
+    """후보 지점 목록 + (처음 쓸 때 만드는) 공간 인덱스."""
+
+    def __init__(self, names, descs, lats, lons, cell_deg=0.25):
+        self.names = [str(n) for n in names]
+        self.descs = [str(d) for d in descs]
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.engine = DistanceEngine(self.lats, self.lons)
+        self._index = None
+        self._stations = None  # (transit, snap 결과): 후보마다 가장 가까운 역
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["name"], data["desc"], data["lat"], data["lon"], **kwargs)
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        return cls([r["name"] for r in rows], [r.get("desc", "") for r in rows],
+                   [float(r["lat"]) for r in rows], [float(r["lon"]) for r in rows], **kwargs)
+
+    def save(self, path):
+        np.savez(path, name=np.array(self.names), desc=np.array(self.descs), lat=self.lats, lon=self.lons)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = GridIndex(self.lats, self.lons, self.cell_deg)
+        return self._index
+
+    def place(self, i):
+        """카카오 검색 결과와 같은 모양의 dict (place_name, x, y, desc)."""
+        return {"place_name": self.names[i], "y": str(self.lats[i]), "x": str(self.lons[i]), "desc": self.descs[i]}
+
+    def within_radius(self, lat, lon, radius_km):
+        """(lat, lon)에서 radius_km 안에 있는 후보 인덱스를 가까운 순으로 돌려줍니다."""
+        d_lat = radius_km / KM_PER_DEG
+        d_lon = radius_km / (KM_PER_DEG * max(math.cos(math.radians(min(89.0, abs(lat) + d_lat))), 1e-6))
+        idx = self.index.query_bbox(lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon)
+        dist = self.engine.distance_matrix([(lat, lon)], idx)[0]
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        return idx[np.argsort(dist, kind="stable")]
+
+    def nearest(self, lat, lon, k=1):
+        """(lat, lon)에서 가장 가까운 후보 k개의 인덱스."""
+        k = min(k, len(self))
+        radius_km = self.cell_deg * KM_PER_DEG
+        while True:
+            idx = self.within_radius(lat, lon, radius_km)
+            if len(idx) >= k or radius_km > 2 * math.pi * 6371:
+                return idx[:k]
+            radius_km *= 2
+
+    def top_k(self, origins, k=3, objective="sum"):
+        """engine.top_k와 같지만, 친구들 주변 영역부터 넓혀가며 후보를 가지치기합니다.
+
+        영역 밖 후보는 모든 친구와 최소 margin만큼 떨어져 있으므로,
+        sum이면 (친구 수 x margin), max면 margin이 점수의 하한이 됩니다.
+        영역 안에서 찾은 k번째 점수가 이 하한 이하면 영역 밖은 볼 필요가 없습니다.
+        var는 이런 하한이 없어서 전체를 계산합니다.
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        if objective not in ("sum", "max") or len(self) <= FULL_SCAN_LIMIT:
+            return self.engine.top_k(origins, k=k, objective=objective)
+
+        lat_min, lon_min = origins.min(axis=0)
+        lat_max, lon_max = origins.max(axis=0)
+        margin = self.cell_deg
+        while True:
+            subset = self.index.query_bbox(lat_min - margin, lat_max + margin, lon_min - margin, lon_max + margin)
+            if len(subset) == len(self):
+                return self.engine.top_k(origins, k=k, objective=objective)
+            if len(subset) >= k:
+                idx, scores, dist = self.engine.top_k(origins, k=k, objective=objective, subset=subset)
+                edge_lat = min(89.0, max(abs(lat_min - margin), abs(lat_max + margin)))
+                margin_km = margin * KM_PER_DEG * math.cos(math.radians(edge_lat))
+                lower = margin_km * (len(origins) if objective == "sum" else 1)
+                if scores[-1] <= lower:
+                    return idx, scores, dist
+            margin *= 2
+
+    def top_k_minutes(self, origins, transit, k=3, objective="sum"):
+        """대중교통 이동시간(분) 기준 top_k: (후보 인덱스 배열, 점수 배열, 친구 x 후보 분 행렬).
+
+        후보들의 가장 가까운 역은 처음 한 번만 구해두고, 매번은 친구들만 역에 붙여서
+        transit 표에서 친구 x 후보 칸을 읽습니다. objective: sum(합계) / max(가장 오래 걸리는 사람).
+        """
+        if self._stations is None or self._stations[0] is not transit:
+            self._stations = (transit, transit.snap(np.column_stack([self.lats, self.lons])))
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        minutes = transit.travel_minutes(transit.snap(origins), self._stations[1],
+                                         direct_km=self.engine.distance_matrix(origins))
+        scores = TRANSIT_OBJECTIVES[objective](minutes)
+        idx = top_k_indices(scores, k)
+        return idx, scores[idx], minutes[:, idx]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python hotspots.py <input.csv> <output.npz>")
+    catalog = HotspotCatalog.from_csv(sys.argv[1])
+    catalog.save(sys.argv[2])
+    print(f"{len(catalog)} hotspots -> {sys.argv[2]}")
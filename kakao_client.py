@@ -0,0 +1,202 @@
+"""카카오 로컬 API 공용 HTTP 클라이언트.
+
+프로세스 전체가 하나의 커넥션 풀(requests.Session)을 공유해서 매 호출마다
+TLS 핸드셰이크를 새로 하지 않도록 하고, 타임아웃/재시도/지연시간 통계를 한곳에서 관리합니다.
+cache(ResponseStore)를 넘기면 성공한 응답을 디스크에 저장해두고 다음 호출부터 재사용합니다.
+governor(RateGovernor)를 넘기면 모든 세션의 호출이 한 쿼터(토큰 버킷)를 나눠 쓰고,
+같은 요청이 동시에 여러 세션에서 들어오면 카카오에는 한 번만 보냅니다.
+이때 프리페치가 먼저 보낸 요청을 결과 화면 호출이 기다리게 되면, 그 요청의 토큰 대기 순서를 결과 화면 우선순위로 올립니다.
+"""
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from governor import PRIORITY_RESULT, QuotaThrottled
+from response_cache import cache_key
+from tracing import record_span
+from ttl_cache import SingleFlight
+
+KAKAO_API_BASE = "https://dapi.kakao.com"
+
+# 재시도할 만한 응답 코드 (쿼터 초과 + 서버 오류)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class KakaoClient:
+    """keep-alive 커넥션 풀 위에서 카카오 API를 호출하는 클라이언트."""
+
+    def __init__(self, api_key, base_url=KAKAO_API_BASE, connect_timeout=2.0, read_timeout=4.0,
+                 deadline=8.0, max_retries=3, backoff=0.3, pool_size=20, cache=None, governor=None):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.governor = governor
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"KakaoAK {api_key}"
+        # 재시도는 아래 get()에서 데드라인을 보며 직접 처리하므로 어댑터 재시도는 끕니다.
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=512)
+        self._counters = {"requests": 0, "retries": 0, "errors": 0, "throttled": 0, "stale_served": 0, "promoted": 0}
+        self._flight = SingleFlight()
+        self._tickets = {}  # 캐시 키 -> 진행 중인 요청의 governor 대기표
+
+    def get(self, path, params=None, priority=PRIORITY_RESULT):
+        """GET 요청 후 JSON을 돌려줍니다. 429/5xx는 데드라인 안에서 백오프 재시도합니다.
+
+        쿼터가 모자라면(조절기가 토큰을 못 주거나 카카오가 끝까지 429면) 만료된 캐시라도 돌려주고,
+        그것도 없으면 QuotaThrottled를 던집니다. priority는 governor의 PRIORITY_* 값입니다.
+        """
+        # 실제 카카오와 가짜 서버(bench/fake_kakao.py)가 같은 캐시 파일을 써도 섞이지 않도록 base_url까지 키에 넣습니다.
+        key = cache_key(f"{self.base_url}{path}", params)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        ticket = self._ticket(key, priority)
+        try:
+            return self._flight.do(key, lambda: self._fetch(path, params, key, priority, ticket))
+        finally:
+            with self._lock:
+                if self._tickets.get(key) is ticket:
+                    del self._tickets[key]
+
+    def _ticket(self, key, priority):
+        """key로 진행 중인 요청의 대기표 (없으면 새로). 더 높은 우선순위로 합류하면 대기표를 올려줍니다."""
+        if self.governor is None:
+            return None
+        with self._lock:
+            ticket = self._tickets.get(key)
+            if ticket is None:
+                ticket = self._tickets[key] = self.governor.ticket(priority)
+                return ticket
+        if self.governor.promote(ticket, priority):
+            with self._lock:
+                self._counters["promoted"] += 1
+        return ticket
+
+    def _fetch(self, path, params, key, priority, ticket=None):
+        try:
+            return self._request(path, params, key, priority, ticket)
+        except QuotaThrottled:
+            with self._lock:
+                self._counters["throttled"] += 1
+            stale = self.cache.get(key, allow_stale=True) if self.cache is not None else None
+            if stale is None:
+                raise
+            with self._lock:
+                self._counters["stale_served"] += 1
+            return stale
+
+    def _request(self, path, params, key, priority, ticket=None):
+        url = f"{self.base_url}{path}"
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            remaining = self._remaining(path, deadline)
+            if self.governor is not None:
+                # 기다리는 중에 합류한 호출 때문에 대기표가 올라갔으면 그 우선순위 기준으로 기다립니다.
+                priority = ticket[0] if ticket is not None else priority
+                wait = min(self.governor.max_wait.get(priority, remaining), remaining)
+                if not self.governor.acquire(priority, timeout=wait, ticket=ticket):
+                    raise QuotaThrottled(f"rate governor: no token for {path} within {wait:.1f}s")
+                remaining = self._remaining(path, deadline)
+            timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+            started = time.perf_counter()
+            try:
+                res = self.session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(path, started, ok=False)
+                delay = self._delay(attempt, None)
+                if not self._should_retry(attempt, deadline, delay):
+                    raise
+            else:
+                self._record(path, started, ok=res.status_code == 200)
+                if res.status_code == 200:
+                    data = res.json()
+                    if self.cache is not None:
+                        self.cache.set(key, data)
+                    return data
+                if res.status_code not in RETRY_STATUS:
+                    res.raise_for_status()
+                delay = self._delay(attempt, res.headers.get("Retry-After"))
+                if not self._should_retry(attempt, deadline, delay):
+                    if res.status_code == 429:
+                        raise QuotaThrottled(f"kakao quota exceeded for {path}", response=res)
+                    res.raise_for_status()
+
+            # 데드라인 확인에 쓴 지연시간 그대로 잡니다 (다시 뽑으면 지터 때문에 데드라인을 넘길 수 있음).
+            time.sleep(delay)
+            attempt += 1
+            with self._lock:
+                self._counters["retries"] += 1
+
+    def _delay(self, attempt, retry_after):
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    def _should_retry(self, attempt, deadline, delay):
+        if attempt >= self.max_retries:
+            return False
+        return time.monotonic() + delay < deadline
+
+    def _remaining(self, path, deadline):
+        """데드라인까지 남은 초. 이미 지났으면 requests.Timeout (0 이하 타임아웃으로 요청하지 않도록)."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"deadline of {self.deadline:.1f}s exceeded for {path}")
+        return remaining
+
+    def _record(self, path, started, ok):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record_span(f"kakao {path.rsplit('/', 1)[-1]}", elapsed_ms, started)
+        with self._lock:
+            self._counters["requests"] += 1
+            if not ok:
+                self._counters["errors"] += 1
+            self._latencies.append(elapsed_ms)
+
+    def stats(self):
+        """요청 수, 지연시간(ms), 커넥션 재사용 횟수를 dict로 돌려줍니다."""
+        with self._lock:
+            counters = dict(self._counters)
+            lat = sorted(self._latencies)
+        counters["coalesced"] = self._flight.coalesced
+        counters["in_flight"] = self._flight.in_flight()
+
+        # urllib3 풀은 새로 연 커넥션 수와 처리한 요청 수를 따로 셉니다. 그 차이가 재사용 횟수입니다.
+        opened = served = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                served += pool.num_requests
+
+        def pct(q):
+            return round(lat[min(len(lat) - 1, int(q * len(lat)))], 1) if lat else None
+
+        return {
+            **counters,
+            "latency_ms_p50": pct(0.50),
+            "latency_ms_p95": pct(0.95),
+            "latency_ms_max": round(lat[-1], 1) if lat else None,
+            "connections_opened": opened,
+            "connections_reused": max(0, served - opened),
+        }
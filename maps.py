@@ -0,0 +1,47 @@
+"""folium 지도를 만들어서 완성된 HTML 문자열로 돌려주는 함수들.
+
+인자가 전부 튜플/숫자/문자열이라 st.cache_data로 그대로 메모이즈할 수 있고,
+같은 장소/친구/상세 목록이면 지도를 다시 만들거나 다시 직렬화하지 않습니다.
+"""
+import folium
+
+
+def render_map(m):
+    return m.get_root().render()
+
+
+def build_result_map(place, friends):
+    """추천 장소(lat, lon) + 친구들 ((lat, lon, 이름, 아이콘 data URI 또는 None), ...) 지도."""
+    pl, plo = place
+    m = folium.Map(location=[pl, plo], tiles="cartodbpositron")
+    folium.Marker([pl, plo], icon=folium.Icon(color='red', icon='star'), tooltip="중간지점").add_to(m)
+
+    for lat, lon, name, icon_uri in friends:
+        ic = folium.CustomIcon(icon_uri, icon_size=(90, 90)) if icon_uri else None
+        folium.Marker([lat, lon], icon=ic, tooltip=name).add_to(m)
+
+    m.fit_bounds([[pl, plo]] + [[lat, lon] for lat, lon, _, _ in friends])
+    return render_map(m)
+
+
+def build_detail_map(place, items):
+    """장소(lat, lon) + 주변 상세 장소 ((lat, lon, 이름), ...) 지도.
+
+    상세 장소는 Marker를 하나씩 만들지 않고 GeoJSON 레이어 하나로 그립니다.
+    """
+    p_lat, p_lon = place
+    m = folium.Map(location=[p_lat, p_lon], zoom_start=15, tiles="cartodbpositron")
+    folium.Marker([p_lat, p_lon], icon=folium.Icon(color='red', icon='star')).add_to(m)
+
+    if items:
+        features = [{
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"place_name": name},
+        } for lat, lon, name in items]
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            marker=folium.Marker(icon=folium.Icon(color='blue', icon='info-sign')),
+            tooltip=folium.GeoJsonTooltip(fields=["place_name"], labels=False),
+        ).add_to(m)
+    return render_map(m)
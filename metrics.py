@@ -0,0 +1,22 @@
+"""프로세스 공용 통계 레지스트리.
+
+캐시/클라이언트 객체는 st.cache_resource 안에 있어서 밖에서 꺼내 쓸 수가 없으니,
+만들 때 stats 함수를 여기에 등록해두고 벤치마크나 디버그 화면에서 한꺼번에 읽습니다.
+"""
+import threading
+
+_lock = threading.Lock()
+_providers = {}
+
+
+def register_stats(name, fn):
+    """name 이름으로 stats() 함수를 등록합니다 (같은 이름이면 덮어씀)."""
+    with _lock:
+        _providers[name] = fn
+
+
+def collect_stats():
+    """등록된 모든 stats()를 불러서 {name: dict}로 돌려줍니다."""
+    with _lock:
+        providers = dict(_providers)
+    return {name: fn() for name, fn in providers.items()}
@@ -0,0 +1,205 @@
+"""친구들 출발지로 '중간 지점'을 구하는 방법들 (구면 기준).
+
+위경도를 그대로 평균하면 몰려 있는 친구들 쪽으로 끌려가고 지구 곡률도 무시하므로,
+좌표를 단위 구 위의 3차원 벡터로 바꿔서 계산합니다.
+- median: 총 이동거리(대원 거리 합)가 가장 작은 점. 구면 Weiszfeld 반복.
+- minimax: 가장 먼 친구까지의 거리가 가장 작은 점 (최소 포함 원의 중심).
+- centroid: (가중) 평균 벡터를 구면에 다시 올린 점.
+모든 계산은 친구 수만큼의 NumPy 배열 연산이고 반복 횟수에 상한이 있습니다.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from distance import EARTH_RADIUS_KM
+
+METHODS = ("median", "minimax", "centroid")
+
+# radius_km: 이 점에서 가장 먼 친구까지의 거리, iterations: 반복 횟수 (centroid는 0)
+Midpoint = namedtuple("Midpoint", ["lat", "lon", "radius_km", "iterations"])
+
+
+def to_unit(lat, lon):
+    """도 단위 위경도 배열 -> (n, 3) 단위 벡터."""
+    lat, lon = np.radians(np.asarray(lat, dtype=np.float64)), np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def from_unit(v):
+    """단위 벡터 하나 -> (lat, lon) 도 단위."""
+    x, y, z = v
+    return float(np.degrees(np.arctan2(z, np.hypot(x, y)))), float(np.degrees(np.arctan2(y, x)))
+
+
+def _normalize(v):
+    n = np.linalg.norm(v)
+    return v / n if n > 0 else v
+
+
+def _angles(points, x):
+    """각 점과 x 사이의 중심각(rad)."""
+    return np.arccos(np.clip(points @ x, -1.0, 1.0))
+
+
+def _result(points, x, iterations):
+    lat, lon = from_unit(x)
+    return Midpoint(lat, lon, float(_angles(points, x).max()) * EARTH_RADIUS_KM, iterations)
+
+
+def weighted_centroid(points, weights=None):
+    """points: (n, 3) 단위 벡터. 가중 평균 벡터를 정규화한 점."""
+    w = np.ones(len(points)) if weights is None else np.asarray(weights, dtype=np.float64)
+    return _normalize(w @ points)
+
+
+def _is_median_at(points, w, k):
+    """k번째 출발지 자체가 최적인지 (나머지가 당기는 힘의 합이 w_k 이하인지) 확인합니다 (Vardi-Zhang)."""
+    p = points[k]
+    cos = points @ p
+    s = np.sqrt(np.maximum(1.0 - cos * cos, 1e-24))
+    others = np.arange(len(points)) != k
+    pull = (w[others] / s[others]) @ (points[others] - cos[others, None] * p)
+    return pull @ pull <= w[k] * w[k]
+
+
+def geometric_median(points, weights=None, x0=None, max_iter=32, tol=1e-6, relax=1.5, check_every=8):
+    """구면 Weiszfeld: x <- normalize(sum(w_i * p_i / sin(theta_i))).
+
+    대원 거리 합의 정지 조건(접평면 방향 기울기 = 0)을 그대로 고정점 반복으로 푼 것입니다.
+    - relax: 한 번에 (다음 점 - 지금 점)의 relax배만큼 움직입니다 (Ostresh, 1~2 사이면 수렴 보장, 반복 수 약 25% 감소).
+    - 답이 출발지 중 하나와 겹치면 Weiszfeld가 아주 느리게 다가가므로, check_every번마다
+      가장 가까운 출발지가 바로 답인지 확인하고 맞으면 거기서 멈춥니다.
+    - x0(이전 결과)를 주면 거기서 시작해서 친구 한 명만 바뀐 경우 몇 번 만에 수렴합니다.
+    (x, 반복 횟수)를 돌려줍니다. tol은 한 번에 움직인 거리(rad) 기준입니다 (1e-6 rad ~ 6m).
+    """
+    w = np.ones(len(points)) if weights is None else np.asarray(weights, dtype=np.float64)
+    x = weighted_centroid(points, w) if x0 is None else _normalize(np.asarray(x0, dtype=np.float64))
+    for it in range(1, max_iter + 1):
+        cos = points @ x
+        if it % check_every == 0:
+            k = int(np.argmax(cos))
+            if _is_median_at(points, w, k):
+                return points[k], it
+        # sin(theta) = sqrt(1 - cos^2). 출발지와 딱 겹치면 발산하므로 아주 작은 값으로 막습니다.
+        s = np.sqrt(np.maximum(1.0 - cos * cos, 1e-24))
+        target = _normalize((w / s) @ points)
+        x_new = _normalize(x + relax * (target - x))
+        step = x_new - x
+        x = x_new
+        if step @ step < tol * tol:
+            return x, it
+    return x, max_iter
+
+
+def _tangent_basis(c):
+    """c 지점의 접평면 (동쪽, 북쪽) 단위 벡터."""
+    east = _normalize(np.cross([0.0, 0.0, 1.0], c))
+    if not east.any():
+        east = np.array([0.0, 1.0, 0.0])
+    return east, np.cross(c, east)
+
+
+def _project(points, c, east, north):
+    """정거 방위도법: c에서의 방향은 그대로, c까지의 거리(rad)도 그대로인 평면 좌표."""
+    theta = _angles(points, c)
+    u, v = points @ east, points @ north
+    r = np.hypot(u, v)
+    scale = np.divide(theta, r, out=np.zeros_like(r), where=r > 0)
+    return np.stack([u * scale, v * scale], axis=-1)
+
+
+def _unproject(q, c, east, north):
+    theta = float(np.hypot(*q))
+    if theta == 0:
+        return c
+    d = (q[0] * east + q[1] * north) / theta
+    return np.cos(theta) * c + np.sin(theta) * d
+
+
+def _first_outside(pts, c, r, start, stop):
+    """pts[start:stop] 중 원 (c, r) 밖에 있는 첫 번째 인덱스 (없으면 None)."""
+    if start >= stop:
+        return None
+    d = np.hypot(*(pts[start:stop] - c).T)
+    out = np.flatnonzero(d > r * (1 + 1e-10) + 1e-15)
+    return start + int(out[0]) if len(out) else None
+
+
+def _circle2(a, b):
+    return (a + b) / 2, float(np.hypot(*(a - b))) / 2
+
+
+def _circle3(a, b, c):
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if abs(d) < 1e-18:
+        # 세 점이 일직선이면 가장 먼 두 점을 지름으로 하는 원
+        pairs = [(a, b), (a, c), (b, c)]
+        return max((_circle2(p, q) for p, q in pairs), key=lambda circle: circle[1])
+    a2, b2, c2 = ax * ax + ay * ay, bx * bx + by * by, cx * cx + cy * cy
+    center = np.array([(a2 * (by - cy) + b2 * (cy - ay) + c2 * (ay - by)) / d,
+                       (a2 * (cx - bx) + b2 * (ax - cx) + c2 * (bx - ax)) / d])
+    return center, float(np.hypot(*(a - center)))
+
+
+def _enclosing_circle(pts):
+    """평면 점들의 최소 포함 원 (Welzl, 반복형). 원 밖의 점은 NumPy로 한꺼번에 찾습니다.
+
+    바깥쪽 점이 앞에 오도록 정렬해서 넘기면 원이 처음 몇 번 만에 거의 정해지고,
+    나머지 점은 한 번의 배열 비교로 끝납니다.
+    """
+    c, r = pts[0], 0.0
+    i = 1
+    while (i := _first_outside(pts, c, r, i, len(pts))) is not None:
+        c, r = pts[i], 0.0
+        j = 0
+        while (j := _first_outside(pts, c, r, j, i)) is not None:
+            c, r = _circle2(pts[i], pts[j])
+            k = 0
+            while (k := _first_outside(pts, c, r, k, j)) is not None:
+                c, r = _circle3(pts[i], pts[j], pts[k])
+                k += 1
+            j += 1
+        i += 1
+    return c, r
+
+
+def minimax_center(points, x0=None, refine=1, tol=1e-6):
+    """가장 먼 점까지의 중심각이 가장 작은 점.
+
+    x0(없으면 평균 벡터)의 접평면에 정거 방위도법으로 펼친 뒤 평면 최소 포함 원을 구합니다.
+    투영 중심에서 멀수록 왜곡이 생기므로, 구한 중심으로 다시 펼쳐서 최대 refine번 더 다듬습니다.
+    (x, 반복 횟수)를 돌려줍니다.
+    """
+    c = weighted_centroid(points) if x0 is None else _normalize(np.asarray(x0, dtype=np.float64))
+    for it in range(1, refine + 2):
+        east, north = _tangent_basis(c)
+        pts = _project(points, c, east, north)
+        pts = pts[np.argsort(-np.hypot(pts[:, 0], pts[:, 1]), kind="stable")]
+        center, _ = _enclosing_circle(pts)
+        c_new = _normalize(_unproject(center, c, east, north))
+        moved = np.linalg.norm(c_new - c)
+        c = c_new
+        if moved < tol:
+            return c, it
+    return c, refine + 1
+
+
+def find_midpoint(origins, method="median", weights=None, x0=None):
+    """origins [(lat, lon), ...] 의 중간 지점을 Midpoint로 돌려줍니다.
+
+    x0는 이전 결과 (lat, lon)입니다. 주면 median/minimax가 거기서 출발합니다 (warm start).
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    points = to_unit(origins[:, 0], origins[:, 1])
+    start = None if x0 is None else to_unit(*x0)
+    if method == "median":
+        x, iterations = geometric_median(points, weights, start)
+    elif method == "minimax":
+        x, iterations = minimax_center(points, start)
+    elif method == "centroid":
+        x, iterations = weighted_centroid(points, weights), 0
+    else:
+        raise ValueError(f"unknown midpoint method: {method}")
+    return _result(points, x, iterations)
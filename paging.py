@@ -0,0 +1,44 @@
+"""카카오 로컬 검색 페이지를 필요한 만큼만 가져오는 generator.
+
+category/keyword 검색은 한 페이지 최대 15개, 최대 45개(3페이지)까지 넘겨줍니다.
+다음 페이지는 소비하는 쪽이 더 달라고 할 때만 요청하고,
+몇 페이지가 더 필요한지 알 수 있으면 그만큼을 스레드 풀에서 동시에 요청합니다.
+"""
+import math
+
+PAGE_SIZE = 15
+MAX_PAGES = 3
+
+
+def last_page(meta, max_pages=MAX_PAGES):
+    """첫 페이지 meta로 알 수 있는 마지막 페이지 번호."""
+    if meta.get("is_end", True):
+        return 1
+    return min(max_pages, max(1, math.ceil(meta.get("pageable_count", 0) / PAGE_SIZE)))
+
+
+def iter_pages(fetch_page, first, last, pool=None, pages_wanted=None):
+    """first..last 페이지를 (page, documents, meta)로 하나씩 내보냅니다.
+
+    fetch_page(page) -> (documents, meta). pages_wanted()가 2 이상을 돌려주면
+    그만큼을 pool에서 한꺼번에 요청하고, 묶음이 다 도착한 뒤에 내보냅니다. 그래서 중간에 그만 받으면
+    그 묶음의 나머지 페이지는 이미 받은 상태이고, 다음 묶음을 요청하지 않을 뿐입니다.
+    묶음 중 하나가 실패하면 아직 시작 안 한 나머지 요청은 취소하고 예외를 올려보냅니다.
+    """
+    page = first
+    while page <= last:
+        n = 1 if pages_wanted is None else max(1, min(pages_wanted(), last - page + 1))
+        if pool is None or n == 1:
+            batch = [fetch_page(page)]
+        else:
+            futures = [pool.submit(fetch_page, p) for p in range(page, page + n)]
+            try:
+                batch = [f.result() for f in futures]
+            finally:
+                for f in futures:
+                    f.cancel()
+        for documents, meta in batch:
+            yield page, documents, meta
+            if meta.get("is_end", True):
+                return
+            page += 1
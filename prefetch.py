@@ -0,0 +1,164 @@
+"""장소 상세(맛집/카페/놀거리) 조회 캐시와 백그라운드 프리페치.
+
+결과 화면이 뜨자마자 top-3 장소 x 카테고리 조회를 스레드 풀에 한꺼번에 던져두고,
+'맛집 보기' 등을 누르면 같은 캐시에서 바로 꺼내 씁니다.
+캐시는 좌표 그대로가 아니라 격자 칸(TileGrid) 단위라서, 가까운 중간 지점끼리 결과를 같이 씁니다.
+칸마다 처음엔 1페이지만 받아두고, 목적(vibe) 필터를 통과한 장소가 모자랄 때만 다음 페이지를 더 받습니다.
+tag를 넘기면 받은 장소를 캐시에 넣기 전에 한 번 분류해두고(vibes.tag_places), 필터/정렬은 그 결과만 읽습니다.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from governor import QuotaThrottled
+from paging import PAGE_SIZE, iter_pages, last_page
+from tiling import TileGrid, rerank
+from ttl_cache import SingleFlight, TTLCache
+
+DETAIL_CATEGORIES = ("FD6", "CE7", "AT4", "CT1")
+
+
+class DetailFetcher:
+    """fetch(lat, lon, category_code, radius, page, background) -> (documents, meta) 앞에 붙는 칸 단위 공용 캐시 + 스레드 풀.
+
+    background는 프리페치에서 온 호출인지 여부입니다 (호출량 조절기에서 우선순위를 낮추는 데 씀).
+    tag(documents)는 받은 페이지마다 한 번 불러서 장소 dict에 분류 결과를 붙이는 함수입니다.
+    """
+
+    def __init__(self, fetch, radius_m=1500, cell_m=100, maxsize=4096, ttl=3600, workers=8, tag=None):
+        self._fetch = fetch
+        self._tag = tag
+        self.radius_m = radius_m
+        self.grid = TileGrid(cell_m)
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flight = SingleFlight()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kakao-prefetch")
+        # 페이지 요청 전용 풀: 위 풀의 작업이 페이지를 기다리다 서로 막히지 않도록 따로 둡니다.
+        self._page_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kakao-pages")
+        # 화면 쪽 동시 조회(get_many) 전용 풀: 프리페치 풀에 쌓인 작업 뒤에 줄 서지 않도록 따로 둡니다.
+        self._result_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kakao-details")
+
+    def get(self, lat, lon, category_code, keep=None, prefer=None, want=PAGE_SIZE, rank=None):
+        """(lat, lon) 반경 안의 장소를 가까운 순으로 돌려줍니다.
+
+        keep은 통과 못 하면 빼는 필터, prefer는 통과하면 앞으로 올리는 조건입니다.
+        (keep과 prefer를 둘 다 통과한) 장소가 want개보다 적으면 다음 페이지를 더 받아옵니다.
+        rank(점수, 클수록 앞)를 주면 prefer 대신 그 점수로 정렬합니다 (같은 점수끼리는 가까운 순).
+        자기 칸 하나만 봅니다. 칸 조회는 반경 + 칸 반대각선만큼 넓게 해두므로 그것만으로 반경 전체를 덮고,
+        다른 세션이 어느 칸을 먼저 받아뒀는지에 따라 결과가 달라지지 않습니다.
+        """
+        cell = self.grid.snap(lat, lon)
+        key = (cell, category_code)
+        entry = self._cell(key)
+        places = self._select(key, entry, lat, lon, keep, prefer, rank)
+        have = sum(1 for p in places if prefer is None or prefer(p))
+        # 같은 칸의 더 받기는 필터가 달라도 한 번에 하나만 돌립니다. 남이 하던 걸 기다렸으면
+        # 그쪽 필터 기준으로 멈췄을 수 있으니, 내 기준으로 다시 세서 모자라면 이어서 더 받습니다.
+        while have < want and entry["pages"] < entry["last_page"]:
+            try:
+                entry = self._flight.do(key + ("more",), lambda: self._extend(key, lat, lon, keep, prefer, want, have))
+            except Exception:
+                # 다음 페이지를 못 받았으면(타임아웃/5xx/쿼터 부족) 이미 받아둔 페이지로 돌려줍니다. 결과가 덜 모일 뿐입니다.
+                entry = self._cache.peek(key) or entry
+                return self._select(key, entry, lat, lon, keep, prefer, rank)
+            places = self._select(key, entry, lat, lon, keep, prefer, rank)
+            have = sum(1 for p in places if prefer is None or prefer(p))
+        return places
+
+    def _select(self, key, entry, lat, lon, keep, prefer, rank=None):
+        places = rerank(entry["docs"], lat, lon, self.radius_m)
+        if keep is not None:
+            places = [p for p in places if keep(p)]
+        if rank is not None or prefer is not None:
+            places.sort(key=rank or prefer, reverse=True)
+        return places
+
+    def _cell(self, key, background=False):
+        entry = self._cache.get(key)
+        if entry is None:
+            # 화면 쪽 조회는 진행 중인 프리페치(낮은 우선순위)를 기다리지 않고 자기 우선순위로 직접 부릅니다.
+            # 같은 페이지 요청이면 KakaoClient에서 하나로 합쳐지고, 그 요청의 우선순위가 올라갑니다.
+            flight_key = key + ("background",) if background else key
+            entry = self._flight.do(flight_key, lambda: self._load(key, background))
+        return entry
+
+    def _fetch_page(self, key, page, background=False):
+        cell, category_code = key
+        c_lat, c_lon = self.grid.center(cell)
+        # 칸 중심에서 반대각선만큼 넓게 조회해야 칸 안 어느 지점이든 원래 반경을 다 덮습니다.
+        radius = int(self.radius_m + self.grid.half_diag_m) + 1
+        documents, meta = self._fetch(c_lat, c_lon, category_code, radius, page, background)
+        if self._tag is not None:
+            documents = self._tag(documents)
+        return documents, meta
+
+    def _load(self, key, background=False):
+        documents, meta = self._fetch_page(key, 1, background)
+        entry = {"docs": documents, "pages": 1, "last_page": last_page(meta)}
+        self._cache.set(key, entry)
+        return entry
+
+    def _extend(self, key, lat, lon, keep, prefer, want, have):
+        """필터를 통과한 장소가 want개 모이거나 페이지가 끝날 때까지 다음 페이지를 받아 칸 캐시에 붙입니다.
+
+        중간 페이지에서 실패해도 그 전까지 받은 페이지는 칸 캐시에 붙여두고 예외를 올려보냅니다.
+        """
+        entry = self._cache.peek(key) or self._cell(key)
+        docs, seen, fetched = list(entry["docs"]), 0, entry["pages"]
+
+        def pages_wanted():
+            # 지금까지의 통과율로 모자란 개수를 채우려면 몇 페이지가 더 필요한지 어림합니다.
+            rate = have / seen if seen else have / max(len(docs), 1)
+            return math.ceil((want - have) / max(rate * PAGE_SIZE, 1))
+
+        pages = iter_pages(lambda page: self._fetch_page(key, page), fetched + 1, entry["last_page"],
+                           pool=self._page_pool, pages_wanted=pages_wanted)
+        try:
+            for page, documents, meta in pages:
+                docs += documents
+                fetched = page
+                if meta.get("is_end", True):
+                    entry = {**entry, "last_page": page}
+                ranked = rerank(documents, lat, lon, self.radius_m)
+                seen += len(documents)
+                have += sum(1 for p in ranked if (keep is None or keep(p)) and (prefer is None or prefer(p)))
+                if have >= want:
+                    break
+        finally:
+            pages.close()
+            if fetched > entry["pages"]:
+                entry = {**entry, "docs": docs, "pages": fetched}
+                self._cache.set(key, entry)
+        return entry
+
+    def _get_or_empty(self, lat, lon, category_code):
+        try:
+            return self.get(lat, lon, category_code)
+        except QuotaThrottled:
+            # 쿼터 부족은 '장소 없음'과 구분해야 하므로 그대로 올려보냅니다.
+            raise
+        except Exception:
+            return []
+
+    def get_many(self, jobs):
+        """(lat, lon, category_code) 목록을 동시에 조회해서 순서대로 돌려줍니다. 실패한 건 [], 쿼터 부족이면 QuotaThrottled."""
+        if not jobs:
+            return []
+        # 첫 번째 조회는 호출한 스레드에서 직접 돌리고, 나머지는 프리페치 풀이 아닌 화면 전용 풀에서 돌립니다.
+        futures = [self._result_pool.submit(self._get_or_empty, *job) for job in jobs[1:]]
+        return [self._get_or_empty(*jobs[0])] + [f.result() for f in futures]
+
+    def prefetch(self, jobs):
+        """아직 캐시에 없는 칸의 첫 페이지 조회를 백그라운드로 미리 시작해둡니다 (기다리지 않음)."""
+        for lat, lon, category_code in jobs:
+            key = (self.grid.snap(lat, lon), category_code)
+            if self._cache.peek(key) is None:
+                self._pool.submit(self._prefetch_cell, key)
+
+    def _prefetch_cell(self, key):
+        try:
+            self._cell(key, background=True)
+        except Exception:
+            pass
+
+    def stats(self):
+        return {**self._cache.stats(), "in_flight": self._flight.in_flight()}
@@ -0,0 +1,316 @@
+"""헤드리스 추천 코어 (Streamlit 없이 import해서 씁니다).
+
+친구 출발지 + 목적(vibe) + 기준(algo)을 받아 추천 장소를 돌려줍니다.
+Streamlit 화면(app.py)과 일괄 처리(batch.py)가 같은 Recommender를 쓰고,
+Recommender 하나가 카카오 클라이언트(커넥션 풀 + 디스크 캐시 + 호출량 조절), 자동완성/상세 조회 캐시,
+핫플레이스 카탈로그와 이동시간 표를 들고 있어서 여러 스레드에서 같이 불러도 됩니다.
+
+    from recommend import recommend
+    recommend([(37.498, 127.028), (37.557, 126.924)], "🍻 술/회식", algo="hotspot")
+
+algo:
+- distance: 중간 지점(midpoint: median/minimax/centroid/transit_sum/transit_max) 근처의 역/터미널
+- hotspot: 전국 주요 번화가 중 점수가 가장 좋은 곳 (rank_by: minutes_sum/minutes_max/sum/max/var)
+"""
+import itertools
+import os
+import threading
+
+from governor import PRIORITY_PREFETCH, PRIORITY_RESULT, PRIORITY_TYPEAHEAD, QuotaThrottled, RateGovernor
+from hotspots import HotspotCatalog
+from kakao_client import KAKAO_API_BASE, KakaoClient
+from midpoint import find_midpoint
+from prefetch import DETAIL_CATEGORIES, DetailFetcher
+from response_cache import ResponseStore
+from tiling import rerank
+from transit import TransitMatrix
+from ttl_cache import SingleFlight, TTLCache
+from typeahead import TypeaheadSearch
+from vibes import DEFAULT_VIBE, VIBE_DETAIL_MODES, VIBES, detail_filters, tag_places
+import tracing
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+HOTSPOT_CATALOG_PATH = os.path.join(DATA_DIR, "hotspots.npz")
+TRANSIT_PATH = os.path.join(DATA_DIR, "transit.npz")
+DEFAULT_CACHE_PATH = ".cache/kakao_responses.sqlite3"
+
+ALGOS = ("distance", "hotspot")
+DETAIL_MODES = {"food": ("FD6",), "cafe": ("CE7",), "play": ("AT4", "CT1")}
+
+
+def as_origins(origins):
+    """[(lat, lon), ...] 를 캐시 키로 쓸 수 있는 float 튜플의 튜플로 맞춥니다."""
+    return tuple((float(lat), float(lon)) for lat, lon in origins)
+
+
+class Recommender:
+    """추천에 필요한 공용 객체 묶음. 프로세스에 하나 만들어서 모든 세션/스레드가 같이 씁니다."""
+
+    def __init__(self, api_key, base_url=KAKAO_API_BASE, cache_path=DEFAULT_CACHE_PATH, rate=10.0, burst=20,
+                 hotspots_path=HOTSPOT_CATALOG_PATH, transit_path=TRANSIT_PATH, ttl=3600):
+        self.store = ResponseStore(cache_path)
+        self.governor = RateGovernor(rate=rate, burst=burst)
+        self.client = KakaoClient(api_key, base_url=base_url, cache=self.store, governor=self.governor)
+        self.typeahead = TypeaheadSearch(self._fetch_keyword)
+        # 상세 장소는 캐시에 들어올 때 한 번 태그를 붙여두고, 목적별 정렬은 그 태그만 봅니다.
+        self.details_fetcher = DetailFetcher(self._fetch_category, radius_m=1500, cell_m=100, tag=tag_places)
+        self.hotspots_path = hotspots_path
+        self.transit_path = transit_path
+        self._catalog = None
+        self._transit = None
+        self._load_lock = threading.Lock()
+        self._hotplaces = TTLCache(maxsize=1024, ttl=ttl)
+        self._rankings = TTLCache(maxsize=1024, ttl=ttl)
+        self._midpoints = TTLCache(maxsize=1024, ttl=ttl)
+        self._flight = SingleFlight()
+
+    # --- 공용 데이터 (처음 쓸 때 읽음) ---
+    @property
+    def catalog(self):
+        """전국 핫플레이스 후보 목록."""
+        if self._catalog is None:
+            with self._load_lock:
+                if self._catalog is None:
+                    self._catalog = HotspotCatalog.load(self.hotspots_path)
+        return self._catalog
+
+    @property
+    def transit(self):
+        """역/터미널 사이 대중교통 이동시간 표."""
+        if self._transit is None:
+            with self._load_lock:
+                if self._transit is None:
+                    self._transit = TransitMatrix.load(self.transit_path)
+        return self._transit
+
+    # --- 카카오 조회 ---
+    def _fetch_keyword(self, query):
+        # 자동완성은 결과 화면 호출에 양보합니다 (토큰이 없으면 오래 안 기다리고 캐시/빈 목록).
+        res = self.client.get("/v2/local/search/keyword.json", {"query": query, "size": 15}, priority=PRIORITY_TYPEAHEAD)
+        return res.get('documents', []), res.get('meta', {}).get('is_end', False)
+
+    def _fetch_category(self, lat, lon, category_code, radius, page, background):
+        params = {"category_group_code": category_code, "x": str(lon), "y": str(lat), "radius": radius, "sort": "accuracy", "page": page}
+        res = self.client.get("/v2/local/search/category.json", params, priority=PRIORITY_PREFETCH if background else PRIORITY_RESULT)
+        return res.get('documents', []), res.get('meta', {})
+
+    def search(self, query):
+        """검색어 자동완성 (카카오 키워드 검색 결과 목록)."""
+        return self.typeahead.search(query)
+
+    def find_place(self, query):
+        """검색어의 첫 번째 키워드 검색 결과 (없으면 None).
+
+        자동완성과 달리 결과 화면 우선순위로 그 검색어를 그대로 조회합니다
+        (짧은 검색어 결과를 걸러 쓰지 않고, 쿼터가 모자라면 QuotaThrottled).
+        """
+        res = self.client.get("/v2/local/search/keyword.json", {"query": query.strip(), "size": 1}, priority=PRIORITY_RESULT)
+        documents = res.get('documents', [])
+        return documents[0] if documents else None
+
+    def hotplaces_near(self, lat, lon, radius=5000, want=3):
+        """(lat, lon) 근처 지하철역부터, 모자라면 터미널로 채운 want개. 쿼터 부족은 QuotaThrottled로 올려보냅니다."""
+        key = (lat, lon, radius, want)
+        places = self._hotplaces.get(key)
+        if places is None:
+            places = self._flight.do(key, lambda: self._load_hotplaces(key))
+        return [dict(p) for p in places]
+
+    def _load_hotplaces(self, key):
+        lat, lon, radius, want = key
+
+        def candidates():
+            # want개가 모이면 뒤쪽 요청은 아예 안 나갑니다.
+            params = {"category_group_code": "SW8", "x": str(lon), "y": str(lat), "radius": radius, "sort": "distance", "size": want}
+            yield from self.client.get("/v2/local/search/category.json", params).get('documents', [])
+            params_k = {"query": "터미널", "x": str(lon), "y": str(lat), "radius": radius, "sort": "distance", "size": want}
+            yield from self.client.get("/v2/local/search/keyword.json", params_k).get('documents', [])
+
+        try:
+            with tracing.span("hotplaces_near"):
+                places = list(itertools.islice(candidates(), want))
+        except QuotaThrottled:
+            # 쿼터 부족은 '장소 없음'으로 캐시하면 안 되므로 그대로 올려보냅니다.
+            raise
+        except Exception:
+            # 타임아웃/5xx 같은 일시적인 실패도 캐시하지 않습니다 (다음 호출에서 다시 시도).
+            return []
+        self._hotplaces.set(key, places)
+        return places
+
+    def details(self, place, mode, vibe=DEFAULT_VIBE):
+        """추천 장소 주변 맛집(food)/카페(cafe)/놀거리(play). 목적(vibe) 점수가 높은 순, 같으면 가까운 순입니다.
+
+        점수는 캐시에 들어올 때 붙여둔 태그로 계산하므로, 같은 장소에서 목적만 바꾸면 다시 조회하지 않고 정렬만 다시 합니다.
+        """
+        p_lat, p_lon = float(place['y']), float(place['x'])
+        keep, prefer, rank = detail_filters(mode, vibe)
+        with tracing.span("details"):
+            if mode == "play":
+                # 두 카테고리를 합쳐 가까운 순으로 다시 세운 뒤, 다른 상세 보기와 같은 규칙으로 거르고(keep) 정렬합니다.
+                # (점수 정렬은 안정 정렬이라 같은 점수끼리는 가까운 순이 유지됩니다.)
+                jobs = [(p_lat, p_lon, code) for code in DETAIL_MODES[mode]]
+                places = rerank([x for docs in self.details_fetcher.get_many(jobs) for x in docs],
+                                p_lat, p_lon, self.details_fetcher.radius_m)
+                if keep is not None:
+                    places = [x for x in places if keep(x)]
+                return sorted(places, key=rank, reverse=True)
+            try:
+                return self.details_fetcher.get(p_lat, p_lon, DETAIL_MODES[mode][0], keep=keep, prefer=prefer, rank=rank)
+            except QuotaThrottled:
+                raise
+            except Exception:
+                return []
+
+    def prefetch(self, places):
+        """추천 장소들의 맛집/카페/놀거리 조회를 백그라운드로 미리 시작합니다."""
+        self.details_fetcher.prefetch([(float(p['y']), float(p['x']), code) for p in places for code in DETAIL_CATEGORIES])
+
+    # --- 순위/중간 지점 ---
+    def rank_hotspots(self, origins, k=3, objective="sum"):
+        """친구들 출발지 기준으로 점수가 가장 좋은 핫플레이스 k개.
+
+        objective: sum/max/var (직선거리 km) 또는 minutes_sum/minutes_max (대중교통 이동시간 분).
+        """
+        origins = as_origins(origins)
+        key = (origins, k, objective)
+        places = self._rankings.get(key)
+        if places is None:
+            with tracing.span("rank_hotspots"):
+                places = self._rank_hotspots(origins, k, objective)
+            self._rankings.set(key, places)
+        return [dict(p) for p in places]
+
+    def _rank_hotspots(self, origins, k, objective):
+        catalog = self.catalog
+        minutes = None
+        if objective.startswith("minutes_"):
+            idx, scores, minutes = catalog.top_k_minutes(origins, self.transit, k=k, objective=objective[len("minutes_"):])
+            dist = catalog.engine.distance_matrix(origins, idx)
+        else:
+            idx, scores, dist = catalog.top_k(origins, k=k, objective=objective)
+        candidates = []
+        for col, (i, score) in enumerate(zip(idx, scores)):
+            place = {**catalog.place(i), "total_dist": float(dist[:, col].sum()), "score": float(score)}
+            if minutes is not None:
+                place.update(total_min=round(float(minutes[:, col].sum())), max_min=round(float(minutes[:, col].max())))
+            candidates.append(place)
+        return candidates
+
+    def midpoint(self, origins, method="median", x0=None):
+        """중간 지점 dict: lat/lon(소수점 4자리) + radius_km, transit_*면 station/total_min/max_min.
+
+        같은 (출발지, 방법)이면 계산해둔 값을 쓰고, 아니면 x0(직전 결과 (lat, lon))에서 출발해서 다시 풉니다.
+        """
+        origins = as_origins(origins)
+        key = (origins, method)
+        mid = self._midpoints.get(key)
+        if mid is None:
+            with tracing.span("midpoint"):
+                mid = self._midpoint(origins, method, x0)
+            self._midpoints.set(key, mid)
+        return dict(mid)
+
+    def _midpoint(self, origins, method, x0):
+        if method.startswith("transit_"):
+            # 좌표 계산 대신 이동시간 표에서 점수가 가장 좋은 역을 중간 지점으로 씁니다.
+            transit = self.transit
+            idx, _, minutes = transit.best_stations(origins, k=1, objective=method[len("transit_"):])
+            i = int(idx[0])
+            return {"method": method, "station": transit.names[i], "lat": float(transit.lats[i]), "lon": float(transit.lons[i]),
+                    "total_min": round(float(minutes[:, 0].sum())), "max_min": round(float(minutes[:, 0].max()))}
+        mid = find_midpoint(origins, method, x0=x0)
+        # 소수점 4자리(약 10m)로 맞춰서 같은 그룹이면 장소 조회 캐시 키가 매번 같게 합니다.
+        return {"method": method, "lat": round(mid.lat, 4), "lon": round(mid.lon, 4), "radius_km": mid.radius_km}
+
+    def rank_by_minutes(self, places, origins, objective="sum"):
+        """카카오 검색 결과 장소들을 친구들 이동시간 기준으로 다시 정렬합니다 (total_min/max_min 추가)."""
+        if not places:
+            return places
+        points = [(float(p['y']), float(p['x'])) for p in places]
+        order, _, minutes = self.transit.rank_points(origins, points, objective)
+        return [{**places[i], "total_min": round(float(minutes[:, col].sum())), "max_min": round(float(minutes[:, col].max()))}
+                for col, i in enumerate(order)]
+
+    # --- 추천 ---
+    def recommend(self, origins, vibe=DEFAULT_VIBE, algo="distance", midpoint="median", rank_by="sum",
+                  k=3, x0=None, with_details=False, prefetch=True):
+        """추천 결과 dict: origins, vibe, algo, midpoint(distance일 때), places, throttled, details(with_details일 때).
+
+        places는 점수 순 k개이고, 쿼터가 모자라서 못 불러왔으면 [] + throttled=True입니다.
+        with_details면 장소마다 목적에 맞는 상세 보기(맛집/카페) 목록을 details에 같이 넣습니다.
+        """
+        if vibe not in VIBES:
+            raise ValueError(f"unknown vibe: {vibe}")
+        if algo not in ALGOS:
+            raise ValueError(f"unknown algo: {algo}")
+        origins = as_origins(origins)
+        result = {"origins": origins, "vibe": vibe, "algo": algo, "midpoint": None, "places": [], "throttled": False}
+        with tracing.span("recommend"):
+            try:
+                if algo == "distance":
+                    mid = result["midpoint"] = self.midpoint(origins, midpoint, x0=x0)
+                    if midpoint.startswith("transit_"):
+                        # 후보를 넉넉히 받아서 이동시간 순으로 다시 고릅니다.
+                        near = self.hotplaces_near(mid["lat"], mid["lon"], radius=5000, want=2 * k)
+                        result["places"] = self.rank_by_minutes(near, origins, midpoint[len("transit_"):])[:k]
+                    else:
+                        result["places"] = self.hotplaces_near(mid["lat"], mid["lon"], radius=5000, want=k)
+                else:
+                    result["places"] = self.rank_hotspots(origins, k=k, objective=rank_by)
+                if result["places"] and prefetch:
+                    self.prefetch(result["places"])
+                if with_details:
+                    mode = VIBE_DETAIL_MODES[vibe]
+                    result["details"] = [self.details(p, mode, vibe)[:10] for p in result["places"]]
+            except QuotaThrottled:
+                result["throttled"] = True
+        return result
+
+    def stats_providers(self):
+        """{이름: stats 함수} (metrics.register_stats에 그대로 등록하는 용도)."""
+        return {
+            "kakao_client": self.client.stats,
+            "response_store": self.store.stats,
+            "governor": self.governor.stats,
+            "typeahead": self.typeahead.stats,
+            "details": self.details_fetcher.stats,
+            "hotplaces": self._hotplaces.stats,
+            "rankings": self._rankings.stats,
+            "midpoints": self._midpoints.stats,
+        }
+
+    def cache_providers(self):
+        """{이름: stats 함수} 중 예전에 st.cache_data였던 결과 캐시들 (tracing.register_cache에 등록하는 용도)."""
+        return {"hotplaces_near": self._hotplaces.stats, "rank_hotspots": self._rankings.stats, "midpoint": self._midpoints.stats}
+
+    def stats(self):
+        return {name: fn() for name, fn in self.stats_providers().items()}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_recommender():
+    """환경변수(KAKAO_REST_API_KEY, KAKAO_API_BASE_URL, MIDMEET_CACHE_PATH, KAKAO_RATE_*)로 만든 프로세스 공용 Recommender."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                api_key = os.environ.get("KAKAO_REST_API_KEY")
+                if not api_key:
+                    raise RuntimeError("KAKAO_REST_API_KEY is not set")
+                _default = Recommender(
+                    api_key.strip(),
+                    base_url=os.environ.get("KAKAO_API_BASE_URL", KAKAO_API_BASE),
+                    cache_path=os.environ.get("MIDMEET_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    rate=float(os.environ.get("KAKAO_RATE_PER_SEC", "10")),
+                    burst=int(os.environ.get("KAKAO_RATE_BURST", "20")),
+                )
+    return _default
+
+
+def recommend(origins, vibe=DEFAULT_VIBE, algo="distance", **kwargs):
+    """default_recommender().recommend(...)의 줄임."""
+    return default_recommender().recommend(origins, vibe, algo, **kwargs)
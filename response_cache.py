@@ -0,0 +1,118 @@
+"""카카오 API 응답을 디스크(SQLite)에 저장하는 영구 캐시.
+
+재시작/배포 후에도 캐시가 남아 있어서 콜드 스타트 때 API 호출이 몰리지 않고,
+WAL 모드라 같은 호스트의 여러 Streamlit 워커 프로세스가 한 파일을 같이 씁니다.
+인메모리 캐시(st.cache_data, TTLCache)는 이 위에 그대로 얹혀 있습니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+
+def cache_key(endpoint, params):
+    """엔드포인트(URL) + 정렬/문자열화한 파라미터로 만든 캐시 키."""
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if v is not None)
+    return f"{endpoint}?{urlencode(items)}"
+
+
+class ResponseStore:
+    """TTL과 최대 개수 제한이 있는 SQLite key-value 캐시.
+
+    만료된 항목도 stale_ttl 동안은 지우지 않고 남겨둡니다. 쿼터가 모자라 카카오를 부를 수 없을 때
+    get(key, allow_stale=True)로 옛 응답이라도 보여주기 위해서입니다.
+    SQLite 오류는 호출한 쪽에서 보면 미스와 같습니다 (misses에 세고, 원인 확인용으로 errors에도 셉니다).
+    """
+
+    def __init__(self, path, ttl=86400, max_entries=50000, evict_every=200, stale_ttl=7 * 86400):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0, "stale_hits": 0}
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                     "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, stored_at REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+
+    def _conn(self):
+        # sqlite3 커넥션은 스레드끼리 공유하면 안 되므로 스레드마다 하나씩 엽니다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def get(self, key, allow_stale=False):
+        try:
+            row = self._conn().execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            self._count("errors")
+            self._count("misses")
+            return None
+        if row is None:
+            self._count("misses")
+            return None
+        if row[1] < time.time():
+            if not allow_stale:
+                self._count("misses")
+                return None
+            self._count("stale_hits")
+        else:
+            self._count("hits")
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        try:
+            self._conn().execute("INSERT OR REPLACE INTO responses (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+                                 (key, json.dumps(value, ensure_ascii=False), expires_at, now))
+        except sqlite3.Error:
+            self._count("errors")
+            return
+        with self._lock:
+            self._counters["writes"] += 1
+            due = self._counters["writes"] % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """만료된 지 stale_ttl이 지난 항목을 지우고, 그래도 max_entries를 넘으면 오래 저장된 것부터 지웁니다."""
+        try:
+            conn = self._conn()
+            removed = conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - self.stale_ttl,)).rowcount
+            excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                removed += conn.execute("DELETE FROM responses WHERE key IN "
+                                        "(SELECT key FROM responses ORDER BY stored_at LIMIT ?)", (excess,)).rowcount
+        except sqlite3.Error:
+            self._count("errors")
+            return
+        self._count("evictions", removed)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        try:
+            stats["size"] = self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error:
+            stats["size"] = None
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+        return stats
@@ -0,0 +1,49 @@
+"""좌표를 격자 칸(cell)으로 스냅해서 근처 좌표끼리 캐시를 같이 쓰게 하는 도구.
+
+'거리 우선 추천'의 중간 지점은 그룹마다 소수점 6자리에서 다 달라서 원래 좌표 그대로는
+캐시가 거의 안 맞습니다. 칸 중심에서 (반경 + 칸 반대각선)만큼 한 번 조회해두면
+그 칸 안의 어떤 지점이든 원래 반경을 다 덮으니, 칸 단위로 재사용할 수 있습니다.
+"""
+import math
+
+import numpy as np
+
+from distance import haversine_rad
+
+M_PER_DEG = 111190.0
+
+
+class TileGrid:
+    """cell_m 미터 크기의 위경도 격자. 경도 폭은 행(위도)마다 cos(위도)로 보정합니다."""
+
+    def __init__(self, cell_m=100):
+        self.cell_m = cell_m
+        self.lat_step = cell_m / M_PER_DEG
+        self.half_diag_m = cell_m * math.sqrt(2) / 2
+
+    def _lon_step(self, row):
+        center_lat = (row + 0.5) * self.lat_step
+        return self.cell_m / (M_PER_DEG * max(math.cos(math.radians(center_lat)), 1e-6))
+
+    def snap(self, lat, lon):
+        """(lat, lon)이 들어 있는 칸 (row, col)."""
+        row = math.floor(lat / self.lat_step)
+        return row, math.floor(lon / self._lon_step(row))
+
+    def center(self, cell):
+        row, col = cell
+        return (row + 0.5) * self.lat_step, (col + 0.5) * self._lon_step(row)
+
+
+def rerank(places, lat, lon, radius_m):
+    """(lat, lon)에서 radius_m 안에 있는 장소만 남기고 가까운 순으로 정렬합니다 (id 기준 중복 제거).
+
+    원본(캐시) dict는 건드리지 않고, distance 필드를 요청 지점 기준으로 바꾼 복사본을 돌려줍니다.
+    """
+    unique = list({p.get("id") or (p["x"], p["y"], p["place_name"]): p for p in places}.values())
+    if not unique:
+        return []
+    coords = np.radians(np.array([(float(p["y"]), float(p["x"])) for p in unique]))
+    dist_m = haversine_rad(math.radians(lat), math.radians(lon), coords[:, 0], coords[:, 1]) * 1000
+    order = np.argsort(dist_m, kind="stable")
+    return [{**unique[i], "distance": str(int(dist_m[i]))} for i in order if dist_m[i] <= radius_m]
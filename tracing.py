@@ -0,0 +1,258 @@
+"""rerun 단위 타이밍 span + 캐시 적중 카운터.
+
+MIDMEET_TRACE=1일 때만 켜집니다. 꺼져 있으면 span()은 아무것도 안 하는 객체를 돌려주고
+캐시 래퍼도 bool 하나만 확인하고 바로 원래 함수를 부르므로 오버헤드가 거의 없습니다.
+
+내보내기:
+- MIDMEET_TRACE_FILE: rerun마다 JSON 한 줄씩 추가 (spans, 총 시간, 상태)
+- MIDMEET_METRICS_FILE: Prometheus 텍스트 포맷 (node_exporter textfile collector용, 최대 1초에 한 번 갱신)
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+from metrics import collect_stats
+
+ENABLED = os.environ.get("MIDMEET_TRACE", "") not in ("", "0")
+TRACE_FILE = os.environ.get("MIDMEET_TRACE_FILE")
+METRICS_FILE = os.environ.get("MIDMEET_METRICS_FILE")
+
+_local = threading.local()
+_lock = threading.Lock()
+_span_totals = {}     # name -> [count, total_ms, max_ms]
+_cache_counts = {}    # name -> {"calls": n, "misses": n}
+_cache_sources = {}   # name -> fn() -> {"hits": n, "misses": n, ...} (traced_cache 밖의 캐시)
+_last_metrics_write = 0.0
+
+
+class Trace:
+    """rerun 한 번 동안 기록된 span 목록."""
+
+    def __init__(self, name):
+        self.name = name
+        self.attrs = {}
+        self.spans = []
+        self.started = time.perf_counter()
+        self.total_ms = None
+        self.status = "running"
+
+    def to_dict(self):
+        return {"ts": time.time(), "name": self.name, "status": self.status, "total_ms": self.total_ms,
+                "attrs": self.attrs, "spans": self.spans}
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record_span(self.name, (time.perf_counter() - self.started) * 1000, self.started)
+        return False
+
+
+def span(name):
+    """with span("이름"): ... 구간의 시간을 잽니다."""
+    return _Span(name) if ENABLED else _NOOP
+
+
+def record_span(name, elapsed_ms, started=None):
+    """이미 잰 구간을 기록합니다. 현재 스레드에 진행 중인 trace가 있으면 거기에도 붙입니다."""
+    if not ENABLED:
+        return
+    with _lock:
+        totals = _span_totals.setdefault(name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += elapsed_ms
+        totals[2] = max(totals[2], elapsed_ms)
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        offset = ((started or time.perf_counter()) - trace.started) * 1000
+        trace.spans.append({"name": name, "ms": round(elapsed_ms, 2), "start_ms": round(offset, 2)})
+
+
+def start_trace(name="rerun"):
+    """현재 스레드에서 새 trace를 시작합니다.
+
+    st.rerun()/st.stop()으로 스크립트가 중간에 끝나면 end_trace()까지 못 가므로,
+    끝나지 않은 이전 trace는 여기서 'interrupted'로 마무리합니다.
+    """
+    if not ENABLED:
+        return None
+    if getattr(_local, "trace", None) is not None:
+        end_trace(status="interrupted")
+    _local.trace = Trace(name)
+    return _local.trace
+
+
+def annotate(**attrs):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.attrs.update(attrs)
+
+
+def end_trace(status="ok"):
+    """현재 trace를 마무리하고 내보낸 뒤 돌려줍니다 (꺼져 있거나 없으면 None)."""
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return None
+    _local.trace = None
+    trace.total_ms = round((time.perf_counter() - trace.started) * 1000, 2)
+    trace.status = status
+    record_span(f"{trace.name}_total", trace.total_ms)
+    _export(trace)
+    return trace
+
+
+def traced_cache(cache_decorator):
+    """st.cache_data 같은 캐시 데코레이터를 감싸서 호출 수/미스 수와 span을 기록합니다.
+
+    캐시 미스일 때만 실제 함수 본문이 실행되므로, 본문 쪽에서 미스를 세고
+    바깥에서 호출을 세면 적중 = 호출 - 미스가 됩니다.
+    """
+    def decorate(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            if ENABLED:
+                _count(name, "misses")
+            return fn(*args, **kwargs)
+
+        cached = cache_decorator(on_miss)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            if not ENABLED:
+                return cached(*args, **kwargs)
+            _count(name, "calls")
+            with _Span(name):
+                return cached(*args, **kwargs)
+
+        call.clear = getattr(cached, "clear", None)
+        return call
+
+    return decorate
+
+
+def traced_fragment(fn):
+    """st.fragment 함수 안쪽에 붙여서, 프래그먼트만 다시 실행될 때도 그 실행을 trace 하나로 남깁니다.
+
+    전체 rerun 중에 불리면 그 rerun의 trace에 span으로만 붙습니다.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        if not ENABLED:
+            return fn(*args, **kwargs)
+        if getattr(_local, "trace", None) is not None:
+            with _Span(name):
+                return fn(*args, **kwargs)
+        start_trace(f"fragment {name}")
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            # st.rerun()도 예외로 빠져나오므로 여기서 끝난 trace는 'interrupted'로 남깁니다.
+            end_trace(status="interrupted")
+            raise
+        end_trace()
+        return result
+
+    return run
+
+
+def _count(name, field):
+    with _lock:
+        counts = _cache_counts.setdefault(name, {"calls": 0, "misses": 0})
+        counts[field] += 1
+
+
+def register_cache(name, fn):
+    """traced_cache로 감싸지 않은 캐시(예: 추천 코어의 TTLCache)도 cache_stats()/Prometheus에 같이 내보냅니다.
+
+    fn()은 hits/misses가 들어 있는 dict를 돌려주면 됩니다 (TTLCache.stats 그대로).
+    """
+    with _lock:
+        _cache_sources[name] = fn
+
+
+def cache_stats():
+    with _lock:
+        counts = {name: dict(c) for name, c in _cache_counts.items()}
+        sources = dict(_cache_sources)
+    for name, fn in sources.items():
+        stats = fn()
+        counts[name] = {"calls": stats["hits"] + stats["misses"], "misses": stats["misses"]}
+    for c in counts.values():
+        c["hits"] = c["calls"] - c["misses"]
+        c["hit_rate"] = round(c["hits"] / c["calls"], 3) if c["calls"] else None
+    return counts
+
+
+def span_stats():
+    with _lock:
+        return {name: {"count": n, "total_ms": round(total, 2), "avg_ms": round(total / n, 2), "max_ms": round(mx, 2)}
+                for name, (n, total, mx) in _span_totals.items()}
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text():
+    """span 합계, 캐시 적중 수(st.cache_data + register_cache), metrics 레지스트리 통계를 Prometheus 텍스트 포맷으로."""
+    lines = ["# TYPE midmeet_span_seconds summary"]
+    for name, s in span_stats().items():
+        lines.append(f'midmeet_span_seconds_count{{span="{_label(name)}"}} {s["count"]}')
+        lines.append(f'midmeet_span_seconds_sum{{span="{_label(name)}"}} {s["total_ms"] / 1000:.6f}')
+    lines.append("# TYPE midmeet_span_seconds_max gauge")
+    for name, s in span_stats().items():
+        lines.append(f'midmeet_span_seconds_max{{span="{_label(name)}"}} {s["max_ms"] / 1000:.6f}')
+    lines.append("# TYPE midmeet_cache_requests_total counter")
+    for name, c in cache_stats().items():
+        lines.append(f'midmeet_cache_requests_total{{cache="{_label(name)}",result="hit"}} {c["hits"]}')
+        lines.append(f'midmeet_cache_requests_total{{cache="{_label(name)}",result="miss"}} {c["misses"]}')
+    lines.append("# TYPE midmeet_stat gauge")
+    for source, stats in collect_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f'midmeet_stat{{source="{_label(source)}",stat="{_label(key)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def _export(trace):
+    global _last_metrics_write
+    if TRACE_FILE:
+        line = json.dumps(trace.to_dict(), ensure_ascii=False)
+        with _lock:
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    if METRICS_FILE:
+        now = time.monotonic()
+        with _lock:
+            if now - _last_metrics_write < 1.0:
+                return
+            _last_metrics_write = now
+        tmp = f"{METRICS_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, METRICS_FILE)
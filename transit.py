@@ -0,0 +1,164 @@
+"""대중교통 이동시간(분) 표.
+
+직선거리로는 '같은 노선 10km'와 '두 번 갈아타는 6km'를 구분할 수 없어서,
+역/터미널 그래프(노선별 구간 시간 + 환승 페널티)로 모든 역 쌍의 최단 시간을 미리 계산해둡니다.
+앱에서는 친구 출발지와 후보 지점을 가장 가까운 역에 붙인 뒤 표에서 읽기만 하므로
+친구 x 후보 배열 읽기 한 번이면 됩니다.
+
+그래프 원본 (data/):
+- transit_stations.csv: name,lat,lon
+- transit_edges.csv: line,from,to,minutes (양방향)
+- transit_lines.csv: line,transfer_min (그 노선으로/에서 갈아탈 때 드는 시간)
+
+표 만들기:
+    python transit.py data/transit_stations.csv data/transit_edges.csv data/transit_lines.csv data/transit.npz
+"""
+import csv
+import heapq
+import sys
+
+import numpy as np
+
+from distance import DistanceEngine, top_k_indices
+
+# 표에서 '갈 수 없음' (uint16 최대값)
+UNREACHABLE = np.iinfo(np.uint16).max
+
+# 역까지/역에서 가는 시간: 기본 대기 + 직선거리 1km당 분 (걷기와 마을버스 사이 어림값)
+ACCESS_BASE_MIN = 3.0
+ACCESS_MIN_PER_KM = 4.0
+
+DEFAULT_TRANSFER_MIN = 5
+
+# 후보별 점수 (작을수록 좋음): 이동시간 합계 / 가장 오래 걸리는 사람
+OBJECTIVES = {
+    "sum": lambda m: m.sum(axis=0),
+    "max": lambda m: m.max(axis=0),
+}
+
+
+def _read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def all_pairs_minutes(n_stations, edges, transfer_min):
+    """역 x 역 최단 시간 표 (분, uint16).
+
+    노드를 (역, 노선)으로 나눠서 같은 역 안에서 노선을 바꾸면 두 노선 페널티 중 큰 값만큼 더합니다.
+    출발역에서는 어느 노선이든 바로 탈 수 있고, 도착역에서는 어느 노선으로 와도 됩니다.
+    edges: [(from_idx, to_idx, line, minutes)], transfer_min: {line: 분}
+    """
+    adj = {}
+    lines_at = [set() for _ in range(n_stations)]
+    for a, b, line, minutes in edges:
+        adj.setdefault((a, line), []).append(((b, line), minutes))
+        adj.setdefault((b, line), []).append(((a, line), minutes))
+        lines_at[a].add(line)
+        lines_at[b].add(line)
+
+    table = np.full((n_stations, n_stations), UNREACHABLE, dtype=np.uint16)
+    for src in range(n_stations):
+        best = {(src, line): 0.0 for line in lines_at[src]}
+        heap = [(0.0, src, line) for line in lines_at[src]]
+        row = table[src]
+        row[src] = 0
+        while heap:
+            t, station, line = heapq.heappop(heap)
+            if t > best.get((station, line), float("inf")):
+                continue
+            row[station] = min(row[station], round(t))
+            moves = list(adj.get((station, line), []))
+            for other in lines_at[station]:
+                if other != line:
+                    penalty = max(transfer_min.get(line, DEFAULT_TRANSFER_MIN), transfer_min.get(other, DEFAULT_TRANSFER_MIN))
+                    moves.append(((station, other), penalty))
+            for node, cost in moves:
+                nt = t + cost
+                if nt < best.get(node, float("inf")):
+                    best[node] = nt
+                    heapq.heappush(heap, (nt, *node))
+    return table
+
+
+class TransitMatrix:
+    """역 좌표 + 모든 역 쌍의 이동시간 표. 조회는 snap() 후 travel_minutes()."""
+
+    def __init__(self, names, lats, lons, minutes):
+        self.names = [str(n) for n in names]
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.minutes = np.asarray(minutes, dtype=np.uint16)
+        self.engine = DistanceEngine(self.lats, self.lons)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["name"], data["lat"], data["lon"], data["minutes"])
+
+    @classmethod
+    def build(cls, stations_csv, edges_csv, lines_csv):
+        stations = _read_csv(stations_csv)
+        index = {row["name"]: i for i, row in enumerate(stations)}
+        transfer_min = {row["line"]: float(row["transfer_min"]) for row in _read_csv(lines_csv)}
+        edges = []
+        for row in _read_csv(edges_csv):
+            missing = [name for name in (row["from"], row["to"]) if name not in index]
+            if missing:
+                raise ValueError(f"unknown station in {edges_csv}: {missing}")
+            edges.append((index[row["from"]], index[row["to"]], row["line"], float(row["minutes"])))
+        minutes = all_pairs_minutes(len(stations), edges, transfer_min)
+        return cls([r["name"] for r in stations], [float(r["lat"]) for r in stations],
+                   [float(r["lon"]) for r in stations], minutes)
+
+    def save(self, path):
+        np.savez_compressed(path, name=np.array(self.names), lat=self.lats, lon=self.lons, minutes=self.minutes)
+
+    def __len__(self):
+        return len(self.names)
+
+    def snap(self, points):
+        """[(lat, lon), ...] 를 가장 가까운 역에 붙여서 (역 인덱스 배열, 역까지 걸리는 분 배열)을 돌려줍니다."""
+        dist = self.engine.distance_matrix(points)
+        idx = dist.argmin(axis=1)
+        km = dist[np.arange(len(idx)), idx]
+        return idx, ACCESS_BASE_MIN + ACCESS_MIN_PER_KM * km
+
+    def travel_minutes(self, origins, targets, direct_km=None):
+        """snap()한 출발지 x 도착지 이동시간 행렬 (friends, candidates), 분.
+
+        출발지 -> 가까운 역 -> (표) -> 도착지 가까운 역 -> 도착지. direct_km(친구 x 후보 직선거리)를 주면
+        역을 거치지 않고 바로 가는 편이 빠른 가까운 거리는 그 시간으로 씁니다.
+        """
+        (o_idx, o_access), (t_idx, t_access) = origins, targets
+        minutes = o_access[:, None] + self.minutes[o_idx[:, None], t_idx[None, :]] + t_access[None, :]
+        if direct_km is not None:
+            minutes = np.minimum(minutes, ACCESS_BASE_MIN + ACCESS_MIN_PER_KM * direct_km)
+        return minutes
+
+    def rank_points(self, origins, points, objective="sum"):
+        """친구 출발지 기준으로 임의 지점들(카카오 검색 결과 등)을 점수 순으로: (순서, 점수, 친구 x 지점 분 행렬)."""
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        direct_km = DistanceEngine(points[:, 0], points[:, 1]).distance_matrix(origins)
+        minutes = self.travel_minutes(self.snap(origins), self.snap(points), direct_km=direct_km)
+        scores = OBJECTIVES[objective](minutes)
+        order = np.argsort(scores, kind="stable")
+        return order, scores[order], minutes[:, order]
+
+    def best_stations(self, origins, k=1, objective="sum"):
+        """모든 역을 후보로 봤을 때 점수가 가장 좋은 역 k개: (역 인덱스 배열, 점수 배열, 친구 x 역 분 행렬)."""
+        o_idx, o_access = self.snap(origins)
+        minutes = o_access[:, None] + self.minutes[o_idx]
+        scores = OBJECTIVES[objective](minutes)
+        idx = top_k_indices(scores, k)
+        return idx, scores[idx], minutes[:, idx]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        sys.exit("usage: python transit.py <stations.csv> <edges.csv> <lines.csv> <output.npz>")
+    transit = TransitMatrix.build(*sys.argv[1:4])
+    transit.save(sys.argv[4])
+    unreachable = int((transit.minutes == UNREACHABLE).sum())
+    print(f"{len(transit)} stations -> {sys.argv[4]} ({transit.minutes.nbytes} bytes, {unreachable} unreachable pairs)")
@@ -0,0 +1,109 @@
+"""검색창(st_searchbox) 자동완성용 캐시.
+
+키 입력마다 keyword.json을 부르지 않도록
+1) 같은 검색어는 TTL/LRU 캐시에서 바로 돌려주고
+2) 더 짧은 검색어의 결과가 '전부' 캐시돼 있으면 그걸 걸러서 바로 돌려주고
+   (이름/주소 글자 포함으로만 거른 근사치라서, 그 사이 긴 검색어를 뒤에서 실제로 조회해 캐시하고 다음부터는 그걸 씀)
+3) 여러 세션에서 동시에 같은 검색어가 들어오면 한 번만 호출합니다.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ttl_cache import SingleFlight, TTLCache
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    return _SPACES.sub(" ", query.strip()).lower()
+
+
+def _matches(item, needle):
+    text = f"{item.get('place_name', '')} {item.get('address_name', '')}".lower().replace(" ", "")
+    return needle in text
+
+
+class TypeaheadSearch:
+    """fetch(query) -> (documents, is_end) 앞에 붙는 공용 자동완성 캐시."""
+
+    def __init__(self, fetch, maxsize=4096, ttl=600, min_prefix=2):
+        self._fetch = fetch
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flight = SingleFlight()
+        self.min_prefix = min_prefix
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="typeahead")
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.prefix_hits = 0
+        self.upstream_calls = 0
+
+    def search(self, query):
+        q = normalize_query(query)
+        if not q:
+            return []
+
+        entry = self._cache.get(q)
+        if entry is not None:
+            return entry[0]
+
+        documents = self._from_prefix(q)
+        if documents is not None:
+            # 근사치는 q의 실제 조회가 끝날 때까지만 씁니다.
+            self._load_later(q)
+            return documents
+
+        return self._flight.do(q, lambda: self._load(q))
+
+    def _from_prefix(self, q):
+        # 짧은 검색어 결과가 한 페이지 안에 전부 들어온(is_end) 경우에만 걸러 쓸 수 있습니다.
+        needle = q.replace(" ", "")
+        for end in range(len(q) - 1, self.min_prefix - 1, -1):
+            entry = self._cache.peek(q[:end])
+            if entry is None or not entry[1]:
+                continue
+            documents = [item for item in entry[0] if _matches(item, needle)]
+            if not documents:
+                return None
+            self.prefix_hits += 1
+            # 카카오는 주소/카테고리/형태소까지 보고 찾으므로 이건 q의 정답과 다를 수 있습니다.
+            # 그래서 q의 캐시 항목으로는 저장하지 않습니다 (저장하면 빠진 결과가 TTL 동안 굳어버림).
+            return documents
+        return None
+
+    def _load_later(self, q):
+        """q의 실제 조회를 백그라운드로 한 번만 시작합니다 (끝나면 _load가 캐시에 넣음)."""
+        with self._lock:
+            if q in self._pending:
+                return
+            self._pending.add(q)
+        self._pool.submit(self._refresh, q)
+
+    def _refresh(self, q):
+        try:
+            self._flight.do(q, lambda: self._load(q))
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(q)
+
+    def _load(self, q):
+        self.upstream_calls += 1
+        documents, is_end = self._fetch(q)
+        self._cache.set(q, (documents, is_end))
+        return documents
+
+    def stats(self):
+        stats = self._cache.stats()
+        # 동시 호출 합치기로 해결된 미스는 업스트림을 타지 않았으니 히트로 봅니다.
+        # (prefix 근사치로 먼저 보여준 검색어도 뒤에서 실제로 조회하므로 upstream_calls에 들어갑니다.)
+        lookups = stats["hits"] + stats["misses"]
+        served = lookups - self.upstream_calls
+        stats.update({
+            "prefix_hits": self.prefix_hits,
+            "coalesced": self._flight.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "hit_rate": round(served / lookups, 3) if lookups else None,
+        })
+        return stats
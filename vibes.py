@@ -0,0 +1,114 @@
+"""만남 목적(vibe) 목록과 장소 태그/점수.
+
+장소가 상세 조회 캐시에 들어올 때 tag_places()로 한 번만 분류해서 place["tags"]에 태그 비트셋(int)을 넣어둡니다.
+분류는 모든 키워드를 합친 정규식 하나로 category_name + place_name을 한 번 훑는 것으로 끝나고,
+목적별 점수는 비트셋 -> 점수 표(2^태그 수 칸)를 미리 만들어둬서 정렬할 때는 표 읽기만 합니다.
+그래서 목적을 바꿔도 문자열을 다시 훑거나 다시 조회하지 않습니다.
+"""
+import re
+
+VIBES = ("🍚 맛집 투어", "🍻 술/회식", "☕ 카페/수다", "📚 스터디/조용함")
+DEFAULT_VIBE = VIBES[0]
+
+# 목적마다 먼저 보여줄 상세 보기 (일괄 처리에서 with_details=True일 때, 모자라면 다음 페이지를 더 받는 기준)
+VIBE_DETAIL_MODES = {"🍚 맛집 투어": "food", "🍻 술/회식": "food", "☕ 카페/수다": "cafe", "📚 스터디/조용함": "cafe"}
+
+ALCOHOL_KWS = ["고기", "곱창", "막창", "갈비", "삼겹살", "구이", "포차", "주점", "호프", "맥주", "이자카야", "술집"]
+
+# 태그 이름 -> 키워드 (category_name 또는 place_name에 들어 있으면 그 태그). 순서가 비트 번호입니다.
+TAG_KEYWORDS = {
+    "alcohol": ALCOHOL_KWS,
+    "board": ["보드"],
+    "study": ["스터디", "북카페", "독서"],
+    "dessert": ["디저트", "베이커리", "제과", "케이크", "브런치", "와플", "빙수", "도넛"],
+    "meal": ["한식", "중식", "일식", "양식", "아시아음식", "해물", "육류", "국밥", "찌개", "뷔페"],
+    "quick": ["패스트푸드", "분식", "간식", "도시락", "편의점"],
+}
+TAGS = tuple(TAG_KEYWORDS)
+TAG_BITS = {name: 1 << i for i, name in enumerate(TAGS)}
+
+# 목적별 규칙
+# - weights: 태그별 점수 (합계가 클수록 앞으로, 같으면 가까운 순 그대로)
+# - exclude: 이 태그가 있으면 (그 목적의 상세 보기에서만) 뺌
+# - qualify: 이 태그가 있는 장소가 모자라면 (그 목적의 상세 보기에서만) 다음 페이지를 더 받음
+VIBE_RULES = {
+    "🍚 맛집 투어": {"weights": {"meal": 2, "quick": -1}, "exclude": (), "qualify": None},
+    "🍻 술/회식": {"weights": {"alcohol": 1}, "exclude": (), "qualify": "alcohol"},
+    "☕ 카페/수다": {"weights": {"dessert": 2, "study": -1}, "exclude": (), "qualify": None},
+    "📚 스터디/조용함": {"weights": {"study": 2, "dessert": -1}, "exclude": ("board",), "qualify": None},
+}
+
+
+def _build_matcher():
+    """키워드 -> 태그 비트 dict와 모든 키워드를 합친 정규식 하나.
+
+    긴 키워드를 먼저 둬서 겹치는 키워드 중 긴 쪽이 잡히게 합니다.
+    """
+    keyword_bits = {}
+    for name, keywords in TAG_KEYWORDS.items():
+        for kw in keywords:
+            keyword_bits[kw] = keyword_bits.get(kw, 0) | TAG_BITS[name]
+    return keyword_bits, re.compile("|".join(re.escape(kw) for kw in sorted(keyword_bits, key=len, reverse=True)))
+
+
+_KEYWORD_BITS, _MATCHER = _build_matcher()
+
+
+def classify(text):
+    """문자열 안의 키워드로 태그 비트셋을 만듭니다."""
+    tags = 0
+    for m in _MATCHER.finditer(text):
+        tags |= _KEYWORD_BITS[m.group()]
+    return tags
+
+
+def tag_places(places):
+    """카카오 검색 결과 dict마다 tags(비트셋)를 채워 넣습니다 (이미 있으면 건너뜀). 같은 리스트를 돌려줍니다."""
+    for p in places:
+        if "tags" not in p:
+            p["tags"] = classify(f"{p.get('category_name', '')}\n{p.get('place_name', '')}")
+    return places
+
+
+def tags_of(place):
+    """place의 태그 비트셋. 캐시를 거치지 않은 dict면 그 자리에서 분류합니다."""
+    tags = place.get("tags")
+    return tag_places([place])[0]["tags"] if tags is None else tags
+
+
+def _score_table(weights):
+    return tuple(sum(w for name, w in weights.items() if mask & TAG_BITS[name]) for mask in range(1 << len(TAGS)))
+
+
+class VibeRanker:
+    """목적 하나의 (keep, prefer, rank) 필터. 모두 tags 비트셋만 봅니다."""
+
+    def __init__(self, weights, exclude=(), qualify=None):
+        self.scores = _score_table(weights)
+        self.exclude_mask = sum(TAG_BITS[name] for name in exclude)
+        self.qualify_mask = TAG_BITS[qualify] if qualify else 0
+
+    def keep(self, place):
+        return not tags_of(place) & self.exclude_mask
+
+    def prefer(self, place):
+        return bool(tags_of(place) & self.qualify_mask)
+
+    def rank(self, place):
+        return self.scores[tags_of(place)]
+
+
+RANKERS = {vibe: VibeRanker(**rule) for vibe, rule in VIBE_RULES.items()}
+
+
+def detail_filters(mode, vibe):
+    """상세 보기(food/cafe/play)에서 쓸 (keep, prefer, rank) 필터.
+
+    점수 정렬(rank)은 어느 상세 보기든 적용하고, 제외(keep)와 모자라면 더 받는 기준(prefer)은
+    그 목적의 상세 보기(VIBE_DETAIL_MODES)에서만 씁니다 (예: 스터디 목적의 보드카페 제외는 카페 보기에서만).
+    """
+    ranker = RANKERS[vibe]
+    own_mode = VIBE_DETAIL_MODES[vibe] == mode
+    prefer = ranker.prefer if ranker.qualify_mask and own_mode else None
+    keep = ranker.keep if ranker.exclude_mask and own_mode else None
+    return keep, prefer, ranker.rank